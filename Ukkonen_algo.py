@@ -1,14 +1,16 @@
 import time
 import tracemalloc
+from array import array
 
 class _SuffixTreeNode:
-    __slots__ = ('children', 'suffix_link', 'start', 'end', 'index')
+    __slots__ = ('children', 'suffix_link', 'start', 'end', 'index', 'leaf_count')
     def __init__(self, start=None, end=None):
         self.children = {}          # map from character to node
         self.suffix_link = None
         self.start = start          # edge start index
         self.end = end              # edge end index (object with .value for leaves)
         self.index = -1             # for leaves: the suffix start position
+        self.leaf_count = 0         # number of leaves in the subtree (set by _count_leaves)
 
 class _End:
     __slots__ = ('value',)
@@ -82,9 +84,362 @@ def _build_ukkonen_tree(text: str):
                 active_node = active_node.suffix_link if active_node.suffix_link else root
     return root
 
+def _count_leaves(root, n: int):
+    """
+    Iterative post-order pass storing in every node the number of leaves
+    (suffixes) in its subtree. Leaves with index >= n (the terminator-only
+    suffix) are not counted.
+    """
+    stack = [(root, False)]
+    while stack:
+        node, done = stack.pop()
+        if not node.children:
+            node.leaf_count = 1 if node.index < n else 0
+        elif done:
+            node.leaf_count = sum(child.leaf_count for child in node.children.values())
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children.values())
+
+def _terminal_for(text: str) -> str:
+    """Najmniejszy znak nieobecny w `text` – unikalny terminator sufiksów."""
+    chars = set(text)
+    code = 0
+    while chr(code) in chars:
+        code += 1
+    return chr(code)
+
+class CompactSuffixTree:
+    """
+    Drzewo sufiksów w układzie struct-of-arrays: węzeł to numer wiersza
+    w równoległych kolumnach `array('i')` zamiast obiektu ze słownikiem
+    dzieci. Dzieci węzła tworzą listę first_child → next_sibling, a znak
+    krawędzi to text[start[dziecko]]. Węzeł 0 to korzeń.
+    Kolumny:
+      - start, end     – etykieta krawędzi wchodzącej: text[start:end + 1],
+      - link           – łącze sufiksowe (dla liści i korzenia: 0),
+      - first_child, next_sibling – lista dzieci (-1 = brak),
+      - suffix_index   – pozycja sufiksu dla liści, -1 dla węzłów wewnętrznych.
+    """
+
+    __slots__ = ('text', 'terminal', '_s', 'start', 'end', 'link',
+                 'first_child', 'next_sibling', 'suffix_index')
+
+    def __init__(self, text: str, terminal: str):
+        self.text = text          # tekst bez terminatora
+        self.terminal = terminal
+        self._s = text + terminal  # tekst, na który wskazują krawędzie
+        self.start = array('i')
+        self.end = array('i')
+        self.link = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.suffix_index = array('i')
+
+    @classmethod
+    def build(cls, text: str):
+        """Buduje drzewo dla `text` + unikalny terminator algorytmem Ukkonena."""
+        tree = cls(text, _terminal_for(text))
+        _build_ukkonen_compact(tree, tree._s)
+        return tree
+
+    def __len__(self):
+        """Liczba węzłów (z korzeniem)."""
+        return len(self.start)
+
+    def nbytes(self) -> int:
+        """Rozmiar buforów wszystkich kolumn w bajtach."""
+        return sum(col.buffer_info()[1] * col.itemsize
+                   for col in (self.start, self.end, self.link, self.first_child,
+                               self.next_sibling, self.suffix_index))
+
+    def _child(self, node: int, ch: str) -> int:
+        """Dziecko `node`, którego krawędź zaczyna się znakiem `ch`, albo -1."""
+        s, start, next_sibling = self._s, self.start, self.next_sibling
+        child = self.first_child[node]
+        while child != -1 and s[start[child]] != ch:
+            child = next_sibling[child]
+        return child
+
+    def find(self, pattern: str) -> list:
+        """Posortowane pozycje wszystkich wystąpień `pattern`."""
+        if self.terminal in pattern:
+            return []
+        s = self._s
+        m = len(pattern)
+        node = 0
+        i = 0
+        while i < m:
+            child = self._child(node, pattern[i])
+            if child == -1:
+                return []
+            start = self.start[child]
+            length = min(self.end[child] - start + 1, m - i)
+            if s[start + 1:start + length] != pattern[i + 1:i + length]:
+                return []
+            node = child
+            i += length
+        n = len(self.text)
+        matches = []
+        stack = [node]
+        while stack:
+            v = stack.pop()
+            child = self.first_child[v]
+            if child == -1:
+                if self.suffix_index[v] < n:  # pomijamy sufiks z samego terminatora
+                    matches.append(self.suffix_index[v])
+            while child != -1:
+                stack.append(child)
+                child = self.next_sibling[child]
+        matches.sort()
+        return matches
+
+def _build_ukkonen_compact(tree: CompactSuffixTree, s: str):
+    """
+    Ukkonen's algorithm writing nodes straight into the columns of `tree`.
+    Leaves keep end = -1 ("global end") during construction and get
+    end = len(s) - 1 at the end. `s` must end with a unique terminator.
+    """
+    start, end, link = tree.start, tree.end, tree.link
+    first_child, next_sibling, suffix_index = tree.first_child, tree.next_sibling, tree.suffix_index
+
+    def new_node(node_start, node_end, index):
+        start.append(node_start)
+        end.append(node_end)
+        link.append(0)
+        first_child.append(-1)
+        next_sibling.append(-1)
+        suffix_index.append(index)
+        return len(start) - 1
+
+    root = new_node(-1, -1, -1)
+    active_node = root
+    active_edge = -1
+    active_length = 0
+    remainder = 0
+
+    for pos, ch in enumerate(s):
+        remainder += 1
+        last_new_node = -1
+        while remainder > 0:
+            if active_length == 0:
+                active_edge = pos
+            edge_char = s[active_edge]
+            # find the child edge starting with edge_char (and its predecessor)
+            prev = -1
+            next_node = first_child[active_node]
+            while next_node != -1 and s[start[next_node]] != edge_char:
+                prev = next_node
+                next_node = next_sibling[next_node]
+            if next_node == -1:
+                # new leaf
+                leaf = new_node(pos, -1, pos - remainder + 1)
+                next_sibling[leaf] = first_child[active_node]
+                first_child[active_node] = leaf
+                if last_new_node != -1:
+                    link[last_new_node] = active_node
+                    last_new_node = -1
+            else:
+                node_end = end[next_node]
+                length = (node_end if node_end >= 0 else pos) - start[next_node] + 1
+                if active_length >= length:
+                    active_edge += length
+                    active_length -= length
+                    active_node = next_node
+                    continue
+                # character on edge
+                if s[start[next_node] + active_length] == ch:
+                    active_length += 1
+                    if last_new_node != -1:
+                        link[last_new_node] = active_node
+                        last_new_node = -1
+                    break
+                # split edge: the split node takes next_node's place among the siblings
+                split_end = start[next_node] + active_length - 1
+                split = new_node(start[next_node], split_end, -1)
+                next_sibling[split] = next_sibling[next_node]
+                if prev == -1:
+                    first_child[active_node] = split
+                else:
+                    next_sibling[prev] = split
+                leaf = new_node(pos, -1, pos - remainder + 1)
+                start[next_node] = split_end + 1
+                first_child[split] = leaf
+                next_sibling[leaf] = next_node
+                next_sibling[next_node] = -1
+                if last_new_node != -1:
+                    link[last_new_node] = split
+                last_new_node = split
+            remainder -= 1
+            if active_node == root and active_length > 0:
+                active_length -= 1
+                active_edge = pos - remainder + 1
+            else:
+                active_node = link[active_node]
+
+    last = len(s) - 1
+    for node in range(1, len(end)):
+        if end[node] == -1:
+            end[node] = last
+
+class SuffixTreeIndex:
+    """
+    Drzewo sufiksów (Ukkonen) budowane raz dla tekstu i używane do wielu
+    zapytań. Do tekstu dopisywany jest unikalny terminator, więc każdy sufiks
+    kończy się w osobnym liściu (brak sufiksów niejawnych). Każdy węzeł
+    zna liczbę liści w swoim poddrzewie, więc `count` działa w O(m).
+    """
+
+    def __init__(self, text: str, root, terminal: str, build_time=0.0):
+        self.text = text              # tekst bez terminatora
+        self.root = root
+        self.terminal = terminal
+        self.build_time = build_time  # jednorazowy koszt budowy drzewa
+        self._s = text + terminal     # tekst, na który wskazują krawędzie
+
+    @classmethod
+    def build(cls, text: str):
+        """Buduje drzewo sufiksów dla `text` algorytmem Ukkonena, O(n)."""
+        t0 = time.perf_counter()
+        terminal = _terminal_for(text)
+        root = _build_ukkonen_tree(text + terminal)
+        _count_leaves(root, len(text))
+        return cls(text, root, terminal, build_time=time.perf_counter() - t0)
+
+    def __len__(self):
+        return len(self.text)
+
+    def _locate(self, pattern: str):
+        """
+        Schodzi od korzenia zgodnie ze wzorcem. Zwraca (węzeł, porównania):
+        węzeł, którego poddrzewo zawiera wszystkie wystąpienia (wzorzec może
+        kończyć się w środku krawędzi prowadzącej do niego), albo None.
+        """
+        s = self._s
+        m = len(pattern)
+        comparisons = 0
+        if self.terminal in pattern:
+            return None, comparisons
+        node = self.root
+        i = 0
+        while i < m:
+            comparisons += 1
+            edge = node.children.get(pattern[i])
+            if edge is None:
+                return None, comparisons
+            length = min(edge.end.value - edge.start + 1, m - i)
+            # pierwszy znak krawędzi zgadza się z kluczem dziecka
+            for k in range(1, length):
+                comparisons += 1
+                if s[edge.start + k] != pattern[i + k]:
+                    return None, comparisons
+            node = edge
+            i += length
+        return node, comparisons
+
+    def _positions(self, node) -> list:
+        """Posortowane pozycje startowe sufiksów z poddrzewa `node`."""
+        if node is None:
+            return []
+        n = len(self.text)
+        matches = []
+        stack = [node]
+        while stack:
+            u = stack.pop()
+            if u.children:
+                stack.extend(u.children.values())
+            elif u.index < n:  # pomijamy sufiks złożony z samego terminatora
+                matches.append(u.index)
+        matches.sort()
+        return matches
+
+    def find(self, pattern: str) -> list:
+        """Posortowane pozycje wszystkich wystąpień `pattern`."""
+        node, _ = self._locate(pattern)
+        return self._positions(node)
+
+    def count(self, pattern: str) -> int:
+        """Liczba wystąpień `pattern` w O(m) – z liczników liści, bez zbierania pozycji."""
+        node, _ = self._locate(pattern)
+        return node.leaf_count if node is not None else 0
+
+    def contains(self, pattern: str) -> bool:
+        """Czy `pattern` występuje w tekście – O(m), bez zbierania liści."""
+        node, _ = self._locate(pattern)
+        return node is not None
+
+    def search(self, pattern: str):
+        """
+        Zapytanie z metrykami jak w `search_ukkonen`; drzewo jest już
+        zbudowane, więc 'build_time' wynosi 0 (koszt budowy: `build_time`
+        indeksu), a 'memory_bytes' to pamięć zaalokowana przez samo zapytanie.
+        """
+        n, m = len(self.text), len(pattern)
+
+        tracemalloc.start()
+        base_current, base_peak = tracemalloc.get_traced_memory()
+
+        t2 = time.perf_counter()
+        node, comparisons = self._locate(pattern)
+        matches = self._positions(node)
+        t3 = time.perf_counter()
+        search_time = t3 - t2
+
+        curr_final, peak_final = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        mem_used = peak_final - base_peak
+        metrics = {
+            'build_time': 0.0,
+            'search_time': search_time,
+            'comparisons': comparisons,
+            'memory_bytes': mem_used,
+            'memory_per_char': mem_used / n if n else 0,
+            'time_per_pattern_char': search_time / m if m else 0
+        }
+        return matches, metrics
+
+    def search_many(self, patterns):
+        """
+        Zapytania wsadowe na jednym drzewie. Zwraca (results, metrics):
+        results[i] to posortowane pozycje dla patterns[i], metrics jak
+        w `search` dla całej partii.
+        """
+        n = len(self.text)
+        total_pat_len = sum(len(p) for p in patterns)
+
+        tracemalloc.start()
+        base_current, base_peak = tracemalloc.get_traced_memory()
+
+        t2 = time.perf_counter()
+        results = []
+        comparisons = 0
+        for pattern in patterns:
+            node, comps = self._locate(pattern)
+            comparisons += comps
+            results.append(self._positions(node))
+        t3 = time.perf_counter()
+        search_time = t3 - t2
+
+        curr_final, peak_final = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        mem_used = peak_final - base_peak
+        metrics = {
+            'build_time': 0.0,
+            'search_time': search_time,
+            'comparisons': comparisons,
+            'memory_bytes': mem_used,
+            'memory_per_char': mem_used / n if n else 0,
+            'time_per_pattern_char': search_time / total_pat_len if total_pat_len else 0
+        }
+        return results, metrics
+
 def search_ukkonen(text: str, pattern: str):
     """
     Wyszukiwanie wzorca w tekście za pomocą suffix tree zbudowanego algorytmem Ukkonena.
+    Jednorazowe zapytanie: buduje `SuffixTreeIndex` i od razu go odpytuje –
+    przy wielu wzorcach lepiej zbudować indeks raz i użyć `search_many`.
     Zwraca:
       - matches: lista pozycji startowych wystąpień
       - metrics: słownik jak w pozostałych implementacjach
@@ -98,64 +453,16 @@ def search_ukkonen(text: str, pattern: str):
 
     # --- Budowa drzewa ---
     t0 = time.perf_counter()
-    root = _build_ukkonen_tree(text)
+    index = SuffixTreeIndex.build(text)
     t1 = time.perf_counter()
     build_time = t1 - t0
 
     curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
 
     # --- Przeszukiwanie w drzewie ---
-    comparisons = 0
     t2 = time.perf_counter()
-    node = root
-    i = 0
-    # schodzimy po krawędziach zgodnie ze wzorcem
-    while i < m:
-        ch = pattern[i]
-        if ch not in node.children:
-            comparisons += 1
-            # brak krawędzi → brak dopasowania
-            search_time = time.perf_counter() - t2
-            mem_used = peak_after_build - base_peak
-            metrics = {
-                'build_time': build_time,
-                'search_time': search_time,
-                'comparisons': comparisons,
-                'memory_bytes': mem_used,
-                'memory_per_char': mem_used / n if n else 0,
-                'time_per_pattern_char': search_time / total_pat_len if total_pat_len else 0
-            }
-            return [], metrics
-        edge = node.children[ch]
-        length = edge.end.value - edge.start + 1
-        # porównania znak po znaku na krawędzi
-        for k in range(length):
-            comparisons += 1
-            if i + k >= m or text[edge.start + k] != pattern[i + k]:
-                search_time = time.perf_counter() - t2
-                mem_used = peak_after_build - base_peak
-                metrics = {
-                    'build_time': build_time,
-                    'search_time': search_time,
-                    'comparisons': comparisons,
-                    'memory_bytes': mem_used,
-                    'memory_per_char': mem_used / n if n else 0,
-                    'time_per_pattern_char': search_time / total_pat_len if total_pat_len else 0
-                }
-                return [], metrics
-        # całe segment pasuje → schodzimy
-        node = edge
-        i += length
-
-    # jeśli wzorzec w drzewie, zbieramy wszystkie sufiksy w poddrzewie
-    matches = []
-    stack = [node]
-    while stack:
-        u = stack.pop()
-        if u.index >= 0:
-            matches.append(u.index)
-        for child in u.children.values():
-            stack.append(child)
+    node, comparisons = index._locate(pattern)
+    matches = index._positions(node)
     t3 = time.perf_counter()
     search_time = t3 - t2
 
@@ -176,7 +483,7 @@ def search_ukkonen(text: str, pattern: str):
         'time_per_pattern_char': time_per_pat_char
     }
 
-    return sorted(matches), metrics
+    return matches, metrics
 
 # ---- Przykład użycia ----
 if __name__ == "__main__":
@@ -185,3 +492,12 @@ if __name__ == "__main__":
     hits, m = search_ukkonen(txt, pat)
     print("Ukkonen → Pozycje:", hits)
     print("          Metryki:", m)
+
+    index = SuffixTreeIndex.build("bananabanaba")
+    hits, m = index.search_many(["ana", "ba", "nab", "x"])
+    print("SuffixTreeIndex → Pozycje:", hits)
+    print("                  Metryki:", m, "budowa:", index.build_time)
+
+    compact = CompactSuffixTree.build("bananabanaba")
+    print("CompactSuffixTree → Pozycje:", compact.find("ana"),
+          f"({len(compact)} węzłów, {compact.nbytes()} B)")
@@ -1,15 +1,108 @@
+import mmap
+import struct
+import sys
 import time
 import tracemalloc
+from array import array
 from collections import deque
 
 class _ACNode:
-    __slots__ = ('children', 'fail', 'output')
+    __slots__ = ('children', 'fail', 'output', 'dict_link')
     def __init__(self):
         self.children = {}
         self.fail = None
-        self.output = []
+        self.output = []        # tylko wzorce kończące się dokładnie w tym węźle
+        self.dict_link = None   # najbliższy węzeł na ścieżce fail, który ma output
 
-def _build_automaton(patterns):
+def _iter_output(node):
+    """
+    Zwraca wszystkie dopasowania kończące się w `node`: własny output
+    węzła, a potem outputy kolejnych węzłów z łańcucha `dict_link`.
+    """
+    out = node if node.output else node.dict_link
+    while out is not None:
+        yield from out.output
+        out = out.dict_link
+
+class _ACDfa:
+    """
+    Automat Aho–Corasick skompilowany do pełnej tablicy przejść (DFA).
+    Alfabet wzorców jest kompaktowany do kolumn 1..k (kolumna 0 to każdy znak
+    spoza wzorców), a `goto[state * width + col]` daje kolejny stan –
+    jedno odczytanie tablicy na znak tekstu, bez chodzenia po linkach fail.
+    Wszystkie tablice są płaskie (array('i') albo memoryview na mmap po
+    `load_automaton`), więc automat da się zapisać i wczytać bez przebudowy.
+    """
+    __slots__ = ('alphabet', 'width', 'goto', 'fail', 'out_link', 'dict_link',
+                 'out_offsets', 'out_ids', 'patterns', '_mmap')
+    def __init__(self, alphabet, width, goto, fail, out_link, dict_link,
+                 out_offsets, out_ids, patterns, mm=None):
+        self.alphabet = alphabet        # znak -> kolumna
+        self.width = width              # liczba kolumn (len(alphabet) + 1)
+        self.goto = goto                # stany * width przejść
+        self.fail = fail                # stan -> link fail
+        self.out_link = out_link        # stan -> pierwszy stan z outputem (on sam lub dict_link), -1 gdy brak
+        self.dict_link = dict_link      # stan -> dict_link jako numer stanu, -1 gdy brak
+        self.out_offsets = out_offsets  # własne outputy stanu s: out_ids[out_offsets[s]:out_offsets[s + 1]]
+        self.out_ids = out_ids          # indeksy wzorców
+        self.patterns = patterns        # indeks -> wzorzec
+        self._mmap = mm
+
+    def close(self):
+        """Zwalnia widoki na zmapowany plik (tylko dla automatu z `load_automaton`)."""
+        if self._mmap is None:
+            return
+        for name in ('goto', 'fail', 'out_link', 'dict_link', 'out_offsets', 'out_ids'):
+            getattr(self, name).release()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _compile_dfa(root, patterns):
+    # numeracja stanów w kolejności BFS: link fail zawsze wskazuje wcześniejszy stan
+    nodes = [root]
+    state_of = {root: 0}
+    chars = set()
+    for node in nodes:
+        for ch, child in node.children.items():
+            chars.add(ch)
+            state_of[child] = len(nodes)
+            nodes.append(child)
+    alphabet = {ch: col for col, ch in enumerate(sorted(chars), 1)}
+    width = len(alphabet) + 1
+    goto = array('i', [0]) * (len(nodes) * width)
+    for state, node in enumerate(nodes):
+        row = state * width
+        fail_row = state_of[node.fail] * width if state else 0
+        for ch, col in alphabet.items():
+            child = node.children.get(ch)
+            if child is not None:
+                goto[row + col] = state_of[child]
+            elif state:
+                goto[row + col] = goto[fail_row + col]
+    fail = array('i', [state_of[node.fail] if node.fail is not None else 0 for node in nodes])
+    dict_link = array('i', [state_of[node.dict_link] if node.dict_link is not None else -1
+                            for node in nodes])
+    out_link = array('i', [state if node.output else dict_link[state]
+                           for state, node in enumerate(nodes)])
+    out_offsets = array('i', [0])
+    out_ids = array('i')
+    for node in nodes:
+        out_ids.extend(idx for idx, _ in node.output)
+        out_offsets.append(len(out_ids))
+    return _ACDfa(alphabet, width, goto, fail, out_link, dict_link,
+                  out_offsets, out_ids, list(patterns))
+
+def _build_automaton(patterns, dfa=False):
+    """
+    Buduje trie wzorców z linkami fail. Przy `dfa=True` dodatkowo kompiluje
+    automat do pełnej tablicy przejść (`_ACDfa`) i zwraca ją zamiast korzenia.
+    """
     root = _ACNode()
     for idx, pat in enumerate(patterns):
         node = root
@@ -30,12 +123,165 @@ def _build_automaton(patterns):
             while f and ch not in f.children:
                 f = f.fail
             nxt.fail = f.children[ch] if f and ch in f.children else root
-            nxt.output += nxt.fail.output
+            # zamiast kopiować outputy z fail – link do najbliższego węzła z outputem
+            nxt.dict_link = nxt.fail if nxt.fail.output else nxt.fail.dict_link
+    if dfa:
+        return _compile_dfa(root, patterns)
     return root
 
-def search(text: str, patterns: list):
+def _search_dfa(dfa, text):
+    """
+    Skanowanie skompilowanym DFA: dokładnie jedno przejście w tablicy na znak.
+    Zwraca (matches, comparisons).
+    """
+    col_of = dfa.alphabet.get
+    width, goto = dfa.width, dfa.goto
+    out_link, dict_link = dfa.out_link, dfa.dict_link
+    out_offsets, out_ids, patterns = dfa.out_offsets, dfa.out_ids, dfa.patterns
+    matches = []
+    state = 0
+    for i, ch in enumerate(text):
+        state = goto[state * width + col_of(ch, 0)]
+        out = out_link[state]
+        while out >= 0:
+            for k in range(out_offsets[out], out_offsets[out + 1]):
+                idx = out_ids[k]
+                pat = patterns[idx]
+                matches.append((i - len(pat) + 1, (idx, pat)))
+            out = dict_link[out]
+    return matches, len(text)
+
+# --- ZAPIS / ODCZYT skompilowanego automatu ---
+# Format (little-endian): nagłówek `_AC_HEADER`, potem kolejno tablice int32:
+# alfabet (kody znaków kolumn 1..k), goto, fail, out_link, dict_link,
+# out_offsets, out_ids, offsety wzorców; na końcu wzorce w UTF-8.
+_AC_MAGIC = b'ACDF'
+_AC_VERSION = 1
+_AC_HEADER = struct.Struct('<4sIIIIIII')
+_AC_INT = 4
+
+def compile_automaton(patterns):
+    """
+    Buduje automat dla `patterns` i kompiluje go do DFA (`_ACDfa`), który
+    można przeszukiwać `search_automaton` i zapisać `save_automaton`.
+    """
+    return _build_automaton(patterns, dfa=True)
+
+def save_automaton(dfa, path):
+    """
+    Zapisuje skompilowany automat do pliku w płaskim, wersjonowanym formacie
+    binarnym (wszystkie tablice jako int32 little-endian).
+    """
+    encoded = [pat.encode('utf-8') for pat in dfa.patterns]
+    pat_offsets = array('i', [0])
+    for raw in encoded:
+        pat_offsets.append(pat_offsets[-1] + len(raw))
+    alphabet = array('i', [0]) * (dfa.width - 1)
+    for ch, col in dfa.alphabet.items():
+        alphabet[col - 1] = ord(ch)
+    n_states = len(dfa.fail)
+    sections = [alphabet, dfa.goto, dfa.fail, dfa.out_link, dfa.dict_link,
+                dfa.out_offsets, dfa.out_ids, pat_offsets]
+    with open(path, 'wb') as f:
+        f.write(_AC_HEADER.pack(_AC_MAGIC, _AC_VERSION, n_states, dfa.width,
+                                len(dfa.patterns), len(dfa.out_ids), pat_offsets[-1], 0))
+        for section in sections:
+            section = array('i', section)
+            if sys.byteorder != 'little':
+                section.byteswap()
+            section.tofile(f)
+        for raw in encoded:
+            f.write(raw)
+
+def load_automaton(path):
+    """
+    Wczytuje automat zapisany przez `save_automaton`. Plik jest mapowany
+    przez `mmap` (tylko do odczytu), a tablice przejść są widokami na zmapowane
+    strony – procesy czytające ten sam plik współdzielą jedną kopię w pamięci.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, n_states, width, n_patterns, n_out, pat_bytes, _ = \
+        _AC_HEADER.unpack_from(mm, 0)
+    if magic != _AC_MAGIC:
+        mm.close()
+        raise ValueError(f"{path}: to nie jest plik automatu Aho–Corasick")
+    if version != _AC_VERSION:
+        mm.close()
+        raise ValueError(f"{path}: nieobsługiwana wersja formatu {version}")
+
+    view = memoryview(mm)
+    pos = _AC_HEADER.size
+
+    def take(count):
+        nonlocal pos
+        start, pos = pos, pos + count * _AC_INT
+        if sys.byteorder == 'little':
+            return view[start:pos].cast('i')
+        section = array('i', view[start:pos])
+        section.byteswap()
+        return section
+
+    alphabet = take(width - 1)
+    goto = take(n_states * width)
+    fail = take(n_states)
+    out_link = take(n_states)
+    dict_link = take(n_states)
+    out_offsets = take(n_states + 1)
+    out_ids = take(n_out)
+    pat_offsets = take(n_patterns + 1)
+    blob = view[pos:pos + pat_bytes]
+    patterns = [str(blob[pat_offsets[i]:pat_offsets[i + 1]], 'utf-8') for i in range(n_patterns)]
+    alphabet = {chr(code): col for col, code in enumerate(alphabet, 1)}
+    for section in (blob, pat_offsets):
+        if isinstance(section, memoryview):
+            section.release()
+    view.release()
+    return _ACDfa(alphabet, width, goto, fail, out_link, dict_link,
+                  out_offsets, out_ids, patterns, mm)
+
+def search_automaton(text: str, dfa):
+    """
+    Przeszukuje `text` gotowym automatem (z `compile_automaton` lub
+    `load_automaton`) – bez fazy budowy, więc 'build_time' wynosi 0.
+    Zwraca (matches, metrics) w tym samym formacie co `search`.
+    """
+    total_pat_len = sum(len(p) for p in dfa.patterns)
+
+    tracemalloc.start()
+    base_current, base_peak = tracemalloc.get_traced_memory()
+    build_time = 0.0
+    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
+
+    t2 = time.perf_counter()
+    matches, comparisons = _search_dfa(dfa, text)
+    t3 = time.perf_counter()
+    search_time = t3 - t2
+
+    curr_final, peak_final = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mem_used = peak_after_build - base_peak
+    mem_per_char = mem_used / len(text) if text else 0
+    time_per_pat_char = search_time / total_pat_len if total_pat_len else 0
+
+    metrics = {
+        'build_time': build_time,
+        'search_time': search_time,
+        'comparisons': comparisons,
+        'memory_bytes': mem_used,
+        'memory_per_char': mem_per_char,
+        'time_per_pattern_char': time_per_pat_char
+    }
+
+    return matches, metrics
+
+def search(text: str, patterns: list, dfa: bool = False):
     """
     Przeszukuje `text` pod kątem wszystkich wzorców z listy `patterns`.
+    Przy `dfa=True` automat jest kompilowany do pełnej tablicy przejść,
+    co daje stały koszt na znak niezależnie od linków fail
+    (kosztem pamięci stany × rozmiar alfabetu).
     Zwraca:
       - matches: lista (pozycja, (indeks_wzorca, wzorzec))
       - metrics: słownik z kluczami:
@@ -51,7 +297,7 @@ def search(text: str, patterns: list):
 
     # budowa automatu i pomiar czasu
     t0 = time.perf_counter()
-    root = _build_automaton(patterns)
+    root = _build_automaton(patterns, dfa)
     t1 = time.perf_counter()
     build_time = t1 - t0
 
@@ -63,18 +309,21 @@ def search(text: str, patterns: list):
     node = root
 
     t2 = time.perf_counter()
-    for i, ch in enumerate(text):
-        # przejścia fail aż znajdziemy krawędź lub root
-        while node and ch not in node.children:
-            comparisons += 1
-            node = node.fail
-        if node:
-            comparisons += 1
-            node = node.children[ch]
-        else:
-            node = root
-        for match in node.output:
-            matches.append((i - len(match[1]) + 1, match))
+    if dfa:
+        matches, comparisons = _search_dfa(root, text)
+    else:
+        for i, ch in enumerate(text):
+            # przejścia fail aż znajdziemy krawędź lub root
+            while node and ch not in node.children:
+                comparisons += 1
+                node = node.fail
+            if node:
+                comparisons += 1
+                node = node.children[ch]
+            else:
+                node = root
+            for match in _iter_output(node):
+                matches.append((i - len(match[1]) + 1, match))
     t3 = time.perf_counter()
     search_time = t3 - t2
 
@@ -97,4 +346,47 @@ def search(text: str, patterns: list):
 
     return matches, metrics
 
+def benchmark_dfa(n: int = 200_000, repeats: int = 3):
+    """
+    Porównuje czas wyszukiwania: przejścia po słownikach `_ACNode` z linkami
+    fail vs. skompilowane DFA. Zwraca listę (nazwa, czas_dict, czas_dfa,
+    porównania_dict, porównania_dfa).
+    """
+    import random
+    import string
+
+    random.seed(0)
+    workloads = [
+        ("losowy tekst, 100 wzorców",
+         ''.join(random.choices(string.ascii_lowercase[:6], k=n)),
+         [''.join(random.choices(string.ascii_lowercase[:6], k=random.randint(3, 8)))
+          for _ in range(100)]),
+        # złośliwe wejście: długie łańcuchy fail po każdym 'b'
+        ("'a'*n + wzorce a^k b",
+         ('a' * 50 + 'b') * (n // 51),
+         ['a' * k + 'b' for k in range(1, 60, 3)] + ['a' * 49 + 'c']),
+    ]
+    results = []
+    for name, text, patterns in workloads:
+        t_dict = t_dfa = 0.0
+        for _ in range(repeats):
+            hits_dict, m_dict = search(text, patterns)
+            hits_dfa, m_dfa = search(text, patterns, dfa=True)
+            assert hits_dict == hits_dfa
+            t_dict += m_dict['search_time']
+            t_dfa += m_dfa['search_time']
+        results.append((name, t_dict / repeats, t_dfa / repeats,
+                        m_dict['comparisons'], m_dfa['comparisons']))
+    return results
+
+# ---- PRZYKŁAD UŻYCIA ----
+if __name__ == "__main__":
+    txt = "ushers"
+    pats = ["he", "she", "his", "hers"]
+    hits, m = search(txt, pats, dfa=True)
+    print("Aho–Corasick (DFA) → Pozycje:", hits)
+    print("                   Metryki:", m)
 
+    print(f"{'Obciążenie':<28} {'dict (s)':>10} {'DFA (s)':>10} {'porówn. dict':>14} {'porówn. DFA':>12}")
+    for name, t_dict, t_dfa, c_dict, c_dfa in benchmark_dfa():
+        print(f"{name:<28} {t_dict:>10.4f} {t_dfa:>10.4f} {c_dict:>14} {c_dfa:>12}")
@@ -1,28 +1,20 @@
 import time
 import tracemalloc
 
-def search_boyer_moore(text: str, pattern: str):
+def _build_bad_character(pattern):
     """
-    Boyer–Moore z heurystyką bad-character i good-suffix.
-    Zwraca:
-      - matches: lista pozycji startowych
-      - metrics: słownik z kluczami:
-          'build_time', 'search_time', 'comparisons',
-          'memory_bytes', 'memory_per_char', 'time_per_pattern_char'
+    Tablica bad-character: ostatnie wystąpienie każdego znaku we wzorcu.
     """
-    m = len(pattern)
-    n = len(text)
-    total_pat_len = m
-
-    # --- START POMIARU PAMIĘCI ---
-    tracemalloc.start()
-    base_current, base_peak = tracemalloc.get_traced_memory()
+    return {ch: i for i, ch in enumerate(pattern)}
 
-    # --- BUDOWA tabel bad-character i good-suffix ---
-    t0 = time.perf_counter()
-    # 1) bad-character
-    last = {ch: i for i, ch in enumerate(pattern)}
-    # 2) good-suffix
+def _build_good_suffix(pattern):
+    """
+    Pełna tablica przesunięć good-suffix liczona raz, przy budowie:
+      - good_suffix[j] – przesunięcie po niedopasowaniu na pozycji j,
+      - match_shift    – przesunięcie po pełnym dopasowaniu (okres wzorca).
+    Dzięki temu każde niedopasowanie kosztuje O(1) zamiast pętli po `prefix`.
+    """
+    m = len(pattern)
     suffix = [-1] * m
     prefix = [False] * m
     for i in range(m - 1):
@@ -33,42 +25,151 @@ def search_boyer_moore(text: str, pattern: str):
             k += 1
         if j == -1:
             prefix[k] = True
-    t1 = time.perf_counter()
-    build_time = t1 - t0
+    # prefix_shift[x] = najmniejsze r >= x (r < m), dla którego pattern[r:]
+    # jest prefiksem wzorca; m, gdy takiego nie ma
+    prefix_shift = [m] * (m + 2)
+    for r in range(m - 1, 0, -1):
+        prefix_shift[r] = r if prefix[m - r] else prefix_shift[r + 1]
+    good_suffix = [0] * m
+    for j in range(m):
+        k = m - 1 - j
+        if k == 0:
+            # niedopasowanie na ostatnim znaku: brak dobrego sufiksu,
+            # o przesunięciu decyduje bad-character (minimum 1)
+            good_suffix[j] = 1
+        elif suffix[k] != -1:
+            good_suffix[j] = j + 1 - suffix[k]
+        else:
+            good_suffix[j] = prefix_shift[j + 2]
+    return good_suffix, prefix_shift[1]
 
-    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
+# dostępne warianty silnika Boyer–Moore
+BM_MODES = ('bm', 'horspool', 'sunday')
 
-    # --- PRZESZUKIWANIE ---
+def _search_bm(text, pattern, last, good_suffix, match_shift, galil, matches):
+    """
+    Pełny Boyer–Moore (bad-character + good-suffix, opcjonalnie reguła Galila).
+    Dopisuje dopasowania do `matches`, zwraca liczbę porównań.
+    """
+    n, m = len(text), len(pattern)
     comparisons = 0
-    matches = []
-    t2 = time.perf_counter()
     i = 0
+    low = 0  # reguła Galila: pattern[:low] już potwierdzony w tym oknie
     while i <= n - m:
         j = m - 1
         # porównujemy od końca
-        while j >= 0:
+        while j >= low:
             comparisons += 1
             if pattern[j] != text[i + j]:
                 break
             j -= 1
-        if j < 0:
+        if j < low:
             matches.append(i)
-            shift = m
+            shift = match_shift
+            if galil:
+                low = m - match_shift
         else:
             # bad-character
             bc_shift = j - last.get(text[i + j], -1)
             # good-suffix
-            gs_shift = m
-            k = m - 1 - j
-            if 0 < k and suffix[k] != -1:
-                gs_shift = j + 1 - suffix[k]
-            else:
-                for r in range(j + 2, m):
-                    if prefix[m - r]:
-                        gs_shift = r
-                        break
-            shift = max(bc_shift, gs_shift)
+            shift = max(bc_shift, good_suffix[j])
+            low = 0
         i += shift
+    return comparisons
+
+def _search_horspool(text, pattern, last, matches):
+    """
+    Horspool: przesunięcie wyznacza tylko znak tekstu pod ostatnią pozycją
+    okna (`last` liczone dla pattern[:-1]).
+    """
+    n, m = len(text), len(pattern)
+    comparisons = 0
+    i = 0
+    while i <= n - m:
+        j = m - 1
+        while j >= 0:
+            comparisons += 1
+            if pattern[j] != text[i + j]:
+                break
+            j -= 1
+        if j < 0:
+            matches.append(i)
+        i += m - 1 - last.get(text[i + m - 1], -1)
+    return comparisons
+
+def _search_sunday(text, pattern, last, matches):
+    """
+    Sunday (quick search): przesunięcie wyznacza znak tuż za oknem.
+    """
+    n, m = len(text), len(pattern)
+    comparisons = 0
+    i = 0
+    while i <= n - m:
+        j = 0
+        while j < m:
+            comparisons += 1
+            if pattern[j] != text[i + j]:
+                break
+            j += 1
+        if j == m:
+            matches.append(i)
+        if i + m >= n:
+            break
+        i += m - last.get(text[i + m], -1)
+    return comparisons
+
+def search_boyer_moore(text: str, pattern: str, galil: bool = False, mode: str = 'bm'):
+    """
+    Boyer–Moore z heurystyką bad-character i good-suffix.
+    Przy `galil=True` stosuje regułę Galila: po dopasowaniu i przesunięciu
+    o okres wzorca nie porównuje ponownie już potwierdzonego prefiksu, co
+    gwarantuje liniową liczbę porównań także na tekstach okresowych.
+    `mode` wybiera wariant silnika (wszystkie korzystają z tej samej tabeli
+    bad-character `last`):
+      - 'bm'       – pełny Boyer–Moore,
+      - 'horspool' – tylko bad-character dla ostatniego znaku okna,
+      - 'sunday'   – tylko bad-character dla znaku za oknem.
+    Warianty Horspool i Sunday pomijają budowę tabeli good-suffix, więc
+    zwykle wygrywają dla krótkich wzorców i dużych alfabetów.
+    Zwraca:
+      - matches: lista pozycji startowych
+      - metrics: słownik z kluczami:
+          'build_time', 'search_time', 'comparisons',
+          'memory_bytes', 'memory_per_char', 'time_per_pattern_char'
+    """
+    if mode not in BM_MODES:
+        raise ValueError(f"Nieznany wariant Boyer–Moore: {mode!r} (dostępne: {', '.join(BM_MODES)})")
+    if galil and mode != 'bm':
+        raise ValueError("Reguła Galila jest dostępna tylko w trybie 'bm'")
+    m = len(pattern)
+    n = len(text)
+    total_pat_len = m
+
+    # --- START POMIARU PAMIĘCI ---
+    tracemalloc.start()
+    base_current, base_peak = tracemalloc.get_traced_memory()
+
+    # --- BUDOWA tabel bad-character i good-suffix ---
+    t0 = time.perf_counter()
+    # 1) bad-character (Horspool pomija ostatni znak wzorca)
+    last = _build_bad_character(pattern[:-1] if mode == 'horspool' else pattern)
+    # 2) good-suffix (tylko pełny Boyer–Moore)
+    if mode == 'bm':
+        good_suffix, match_shift = _build_good_suffix(pattern)
+    t1 = time.perf_counter()
+    build_time = t1 - t0
+
+    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
+
+    # --- PRZESZUKIWANIE ---
+    matches = []
+    t2 = time.perf_counter()
+    if mode == 'bm':
+        comparisons = _search_bm(text, pattern, last, good_suffix, match_shift, galil, matches)
+    elif mode == 'horspool':
+        comparisons = _search_horspool(text, pattern, last, matches)
+    else:
+        comparisons = _search_sunday(text, pattern, last, matches)
     t3 = time.perf_counter()
     search_time = t3 - t2
 
@@ -94,6 +195,7 @@ def search_boyer_moore(text: str, pattern: str):
 if __name__ == "__main__":
     txt = "abracadabra"
     pat = "abra"
-    hits, m = search_boyer_moore(txt, pat)
-    print("Boyer–Moore → Pozycje:", hits)
-    print("           Metryki:", m)
+    for mode in BM_MODES:
+        hits, m = search_boyer_moore(txt, pat, mode=mode)
+        print(f"Boyer–Moore ({mode}) → Pozycje:", hits)
+        print("           Metryki:", m)
@@ -1,10 +1,177 @@
 import time
 import tracemalloc
+from functools import lru_cache
+
+# ile skompilowanych wzorców trzymamy w cache `compile_kmp`
+KMP_CACHE_SIZE = 1024
+# domyślny rozmiar kawałka przy czytaniu z pliku w trybie strumieniowym
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+def iter_chunks(source, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Zwraca kolejne kawałki wejścia:
+      - dla obiektu plikowego (ma metodę `read`) – `read(chunk_size)` aż do końca,
+      - dla każdego innego obiektu – jego elementy (dowolny iterable kawałków).
+    """
+    read = getattr(source, 'read', None)
+    if read is None:
+        yield from source
+        return
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _build_lps(pattern):
+    """
+    Liczy tablicę LPS (longest proper prefix-suffix) dla `pattern`.
+    """
+    m = len(pattern)
+    lps = [0] * m
+    length = 0
+    i = 1
+    while i < m:
+        if pattern[i] == pattern[length]:
+            length += 1
+            lps[i] = length
+            i += 1
+        else:
+            if length:
+                length = lps[length - 1]
+            else:
+                lps[i] = 0
+                i += 1
+    return lps
+
+
+class KMPPattern:
+    """
+    Skompilowany wzorzec KMP: tablica LPS liczona jest raz w konstruktorze,
+    a potem używana przy przeszukiwaniu dowolnej liczby tekstów.
+    Podklasy mogą liczyć tablicę przejść inaczej (`_failure_table`),
+    korzystając z tego samego automatu i trybu strumieniowego.
+    """
+    __slots__ = ('pattern', 'lps')
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.lps = self._failure_table(pattern)
+
+    @staticmethod
+    def _failure_table(pattern):
+        """Tablica przejść po niedopasowaniu – dla KMP tablica LPS."""
+        return _build_lps(pattern)
+
+    def _with_pattern(self, pattern):
+        """Matcher tego samego rodzaju dla `pattern` (np. wzorca jako bajty)."""
+        return compile_kmp(pattern)
+
+    def _iter_matches(self, text, state):
+        """
+        Jedyna kopia automatu KMP: jednoprzebiegowe przeszukiwanie `text`
+        ze stanem `state = [pj, comparisons]` (liczba dopasowanych już znaków
+        wzorca i licznik porównań znak–znak). Leniwie zwraca pozycje dopasowań
+        w `text`; po wyczerpaniu generatora `state` zawiera stan końcowy.
+        """
+        pattern, lps = self.pattern, self.lps
+        n, m = len(text), len(pattern)
+        if m == 0:
+            # pusty wzorzec pasuje na każdej pozycji tekstu
+            yield from range(n)
+            return
+        pj, comparisons = state
+        ti = 0  # indeks w text
+        while ti < n:
+            comparisons += 1
+            if text[ti] == pattern[pj]:
+                ti += 1
+                pj += 1
+                if pj == m:
+                    state[0], state[1] = lps[pj - 1], comparisons
+                    yield ti - pj
+                    pj = lps[pj - 1]
+            else:
+                if pj:
+                    pj = lps[pj - 1]
+                else:
+                    ti += 1
+        state[0], state[1] = pj, comparisons
+
+    def _scan(self, text, matches, pj=0, offset=0):
+        """
+        Przeszukuje cały `text`, zaczynając ze stanem `pj` (liczba dopasowanych
+        już znaków wzorca). Pozycje dopasowań, przesunięte o `offset`,
+        dopisuje do `matches`.
+        Zwraca (pj po ostatnim znaku, liczba porównań znak–znak).
+        """
+        state = [pj, 0]
+        matches.extend(offset + pos for pos in self._iter_matches(text, state))
+        return state[0], state[1]
+
+    def search(self, text):
+        """Zwraca listę pozycji startowych wszystkich wystąpień w `text`."""
+        matches = []
+        self._scan(text, matches)
+        return matches
+
+    def finditer(self, text):
+        """Leniwie zwraca kolejne pozycje startowe wystąpień w `text`."""
+        return self._iter_matches(text, [0, 0])
+
+    def count(self, text):
+        """Zwraca liczbę (nakładających się) wystąpień wzorca w `text`."""
+        total = 0
+        for _ in self.finditer(text):
+            total += 1
+        return total
+
+    def finditer_stream(self, source, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Tryb strumieniowy: przeszukuje plik (tekstowy lub binarny) albo dowolny
+        iterable kawałków, przenosząc stan `pj` między kawałkami, i leniwie
+        zwraca bezwzględne pozycje wystąpień (w znakach dla `str`, w bajtach
+        dla danych binarnych). Poza bieżącym kawałkiem pamięć to O(m).
+        """
+        matcher = self
+        pj = 0
+        offset = 0
+        for chunk in iter_chunks(source, chunk_size):
+            if isinstance(chunk, str) != isinstance(matcher.pattern, str):
+                # wzorzec musi być tego samego typu co dane: str albo bajty
+                matcher = _matcher_for_chunk(self, chunk)
+            matches = []
+            pj, _ = matcher._scan(chunk, matches, pj, offset)
+            offset += len(chunk)
+            yield from matches
+
+
+def _matcher_for_chunk(compiled, chunk):
+    """
+    Zwraca matcher tego samego rodzaju co `compiled` ze wzorcem w tej samej
+    postaci co `chunk` (str albo bajty UTF-8).
+    """
+    if isinstance(chunk, str):
+        return compiled._with_pattern(bytes(compiled.pattern).decode('utf-8'))
+    return compiled._with_pattern(compiled.pattern.encode('utf-8'))
+
+
+@lru_cache(maxsize=KMP_CACHE_SIZE)
+def compile_kmp(pattern):
+    """
+    Zwraca `KMPPattern` dla `pattern`, korzystając z ograniczonego cache (LRU)
+    kluczowanego napisem wzorca – ten sam wzorzec nie jest kompilowany ponownie.
+    """
+    return KMPPattern(pattern)
 
 def search_kmp(text: str, pattern: str):
     """
     KMP: najpierw liczymy tablicę LPS (longest proper prefix-suffix),
     potem jednoprzebiegowe przeszukiwanie.
+    Cienka nakładka na `KMPPattern`; przy wielokrotnym użyciu tego samego
+    wzorca lepiej sięgnąć po `compile_kmp(pattern).search(text)`.
     Zwraca:
       - matches: lista pozycji startowych
       - metrics: słownik z kluczami:
@@ -20,48 +187,17 @@ def search_kmp(text: str, pattern: str):
 
     # --- BUDOWA (liczenie LPS) ---
     t0 = time.perf_counter()
-    # przygotowanie LPS
-    lps = [0] * total_pat_len
-    length = 0
-    i = 1
-    while i < total_pat_len:
-        if pattern[i] == pattern[length]:
-            length += 1
-            lps[i] = length
-            i += 1
-        else:
-            if length:
-                length = lps[length - 1]
-            else:
-                lps[i] = 0
-                i += 1
+    compiled = KMPPattern(pattern)
     t1 = time.perf_counter()
     build_time = t1 - t0
 
     curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
 
     # --- PRZESZUKIWANIE + LICZNIK PORÓWNAŃ ---
-    comparisons = 0
     matches = []
-    n, m = len(text), total_pat_len
+    n = len(text)
     t2 = time.perf_counter()
-
-    ti = 0  # indeks w text
-    pj = 0  # indeks w pattern
-    while ti < n:
-        comparisons += 1
-        if text[ti] == pattern[pj]:
-            ti += 1
-            pj += 1
-            if pj == m:
-                matches.append(ti - pj)
-                pj = lps[pj - 1]
-        else:
-            if pj:
-                pj = lps[pj - 1]
-            else:
-                ti += 1
-
+    _, comparisons = compiled._scan(text, matches)
     t3 = time.perf_counter()
     search_time = t3 - t2
 
@@ -85,6 +221,15 @@ def search_kmp(text: str, pattern: str):
 
     return matches, metrics
 
+def search_kmp_stream(source, pattern, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Strumieniowy KMP po pliku lub iterable kawałków – nie wczytuje całego
+    tekstu do pamięci. Leniwie zwraca bezwzględne pozycje startowe wystąpień.
+    Dla plików binarnych wzorzec `str` jest kodowany w UTF-8, a pozycje są
+    liczone w bajtach.
+    """
+    return compile_kmp(pattern).finditer_stream(source, chunk_size)
+
 # ---- PRZYKŁAD UŻYCIA ----
 if __name__ == "__main__":
     txt = "abracadabra"
@@ -0,0 +1,131 @@
+"""
+parallel_search.py
+
+Równoległe przeszukiwanie dużych tekstów dowolnym algorytmem dla jednego wzorca
+(Naive, KMP, Boyer–Moore, Rabin–Karp, Z). Tekst trafia raz do pamięci
+współdzielonej, a procesy robocze dostają tylko granice swoich kawałków.
+"""
+
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from naive_pattern_matching import search_naive
+from kmp_algorithm import search_kmp
+from boyer_moore_algorithm import search_boyer_moore
+from rabin_karp_algorithm import search_rabin_karp
+from z_algorithm import search_z
+
+ENGINES = {
+    'naive': search_naive,
+    'kmp': search_kmp,
+    'boyer_moore': search_boyer_moore,
+    'rabin_karp': search_rabin_karp,
+    'z': search_z,
+}
+
+# metryki sumowane po wszystkich kawałkach
+_SUMMED_METRICS = ('build_time', 'search_time', 'comparisons', 'memory_bytes')
+# liczniki zwracane tylko przez niektóre algorytmy – sumowane, gdy są obecne
+_OPTIONAL_SUMMED_METRICS = ('spurious_hits',)
+
+
+def _encode_text(text: str):
+    """
+    Koduje tekst w stałej szerokości znaku, tak by kawałek [start, end) dało
+    się wyciąć z bufora bez dekodowania całości. Zwraca (bajty, kodowanie, szerokość).
+    """
+    if text.isascii():
+        return text.encode('ascii'), 'ascii', 1
+    # surrogatepass: samotne surogaty (poprawne w str) przechodzą bez zmian
+    return text.encode('utf-32-le', 'surrogatepass'), 'utf-32-le', 4
+
+
+def _search_chunk(shm_name, encoding, width, start, end, own_end, pattern, engine):
+    """
+    Proces roboczy: dekoduje text[start:end] z pamięci współdzielonej
+    i przeszukuje go wybranym algorytmem. Zwraca tylko dopasowania zaczynające
+    się przed `own_end`, więc trafienia z zakładki nie dublują się
+    z sąsiednim kawałkiem.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        chunk = str(shm.buf[start * width:end * width], encoding, 'surrogatepass')
+    finally:
+        shm.close()
+    matches, metrics = ENGINES[engine](chunk, pattern)
+    return [start + pos for pos in matches if start + pos < own_end], metrics
+
+
+def _merge_metrics(all_metrics, n, m, wall_time, chunks, workers):
+    metrics = {key: sum(mt[key] for mt in all_metrics) for key in _SUMMED_METRICS}
+    for key in _OPTIONAL_SUMMED_METRICS:
+        if all(key in mt for mt in all_metrics):
+            metrics[key] = sum(mt[key] for mt in all_metrics)
+    metrics['memory_per_char'] = metrics['memory_bytes'] / n if n else 0
+    metrics['time_per_pattern_char'] = metrics['search_time'] / m if m else 0
+    metrics['wall_time'] = wall_time
+    metrics['chunks'] = chunks
+    metrics['workers'] = workers
+    return metrics
+
+
+def search_parallel(text: str, pattern: str, engine: str = 'kmp',
+                    workers: int = None, chunk_size: int = None):
+    """
+    Dzieli `text` na kawałki zachodzące na siebie o len(pattern) - 1 znaków,
+    przeszukuje je algorytmem `engine` (klucz z `ENGINES`) w puli procesów
+    i scala posortowane dopasowania.
+    Zwraca:
+      - matches: posortowana lista pozycji startowych
+      - metrics: metryki wszystkich procesów zsumowane ('build_time',
+          'search_time', 'comparisons', 'memory_bytes' – łączna praca,
+          oraz 'spurious_hits', jeśli zwraca je algorytm, np. Rabin–Karp),
+          przeliczone 'memory_per_char' i 'time_per_pattern_char' oraz
+          'wall_time', 'chunks', 'workers'.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Nieznany algorytm: {engine!r} (dostępne: {', '.join(ENGINES)})")
+    n, m = len(text), len(pattern)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = -(-n // workers) if n else 1
+    chunk_size = max(chunk_size, m, 1)
+
+    t0 = time.perf_counter()
+    if m == 0 or n <= chunk_size or workers == 1:
+        matches, metrics = ENGINES[engine](text, pattern)
+        return matches, _merge_metrics([metrics], n, m, time.perf_counter() - t0, 1, 1)
+
+    data, encoding, width = _encode_text(text)
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        del data
+        bounds = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_search_chunk, shm.name, encoding, width,
+                                   start, min(own_end + m - 1, n), own_end, pattern, engine)
+                       for start, own_end in bounds]
+            results = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    matches = list(heapq.merge(*(hits for hits, _ in results)))
+    metrics = _merge_metrics([mt for _, mt in results], n, m,
+                             time.perf_counter() - t0, len(bounds), workers)
+    return matches, metrics
+
+
+# ---- PRZYKŁADOWE UŻYCIE ----
+if __name__ == "__main__":
+    txt = "abracadabra" * 50_000
+    pat = "abra"
+    for name in ENGINES:
+        hits, m = search_parallel(txt, pat, engine=name, workers=4)
+        print(f"{name:<12} → {len(hits)} dopasowań, wall {m['wall_time']:.3f}s, "
+              f"porównania {m['comparisons']}"
+              + (f", fałszywe trafienia {m['spurious_hits']}" if 'spurious_hits' in m else ""))
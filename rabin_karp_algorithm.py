@@ -1,33 +1,104 @@
 import time
 import tracemalloc
 
-def search_rabin_karp(text: str, pattern: str):
+try:
+    import numpy as np
+except ImportError:  # NumPy potrzebny tylko w trybie vectorized=True
+    np = None
+
+BASE = 256
+MOD = 10**9 + 7
+# drugi, niezależny hash dla trybu double_hash
+BASE2 = 911382323
+MOD2 = 10**9 + 9
+
+def _text_codes(text: str):
+    """Kody znaków tekstu (jak `ord`, także dla samotnych surogatów) jako tablica NumPy uint64."""
+    if text.isascii():
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    return codes.astype(np.uint64)
+
+def _powers_mod(base: int, count: int, mod: int):
+    """Tablica base^k mod `mod` dla k = 0..count-1, liczona przez podwajanie."""
+    pw = np.empty(count, dtype=np.uint64)
+    pw[0] = 1
+    filled = 1
+    step = base % mod
+    while filled < count:
+        take = min(filled, count - filled)
+        pw[filled:filled + take] = pw[:take] * np.uint64(step) % np.uint64(mod)
+        filled += take
+        step = step * step % mod
+    return pw
+
+def _numpy_window_mask(codes, m: int, pat_hash: int, base: int, mod: int):
+    """
+    Zwraca maskę okien, których hash równa się `pat_hash` – ten sam zbiór
+    co w skalarnym rolling hashu, ale liczony naraz dla całego tekstu.
+    Zamiast hasha okna H_i porównujemy sumę prefiksową
+    W_i = sum c[t] * base^(n-1-t) po oknie, czyli H_i * base^(n-m-i),
+    z pat_hash * base^(n-m-i) (base jest odwracalne modulo liczba pierwsza).
+    Wszystkie iloczyny są < mod^2, więc mieszczą się w uint64.
+    """
+    n = len(codes)
+    umod = np.uint64(mod)
+    pw = _powers_mod(base, n, mod)
+    weighted = codes % umod * pw[::-1] % umod
+    prefix = np.zeros(n + 1, dtype=np.uint64)
+    np.cumsum(weighted, out=prefix[1:])
+    window = (prefix[m:] - prefix[:-m]) % umod
+    target = np.uint64(pat_hash) * pw[n - m::-1] % umod
+    return window == target
+
+def search_rabin_karp(text: str, pattern: str, vectorized: bool = False,
+                      double_hash: bool = False):
     """
     Rabin–Karp: rolling hash + weryfikacja przy hash-match.
+    Przy `vectorized=True` (wymaga NumPy) hashe wszystkich okien liczone są
+    naraz z tablic sum prefiksowych, a w Pythonie weryfikowane są tylko
+    pozycje kandydujące – wynik i metryki porównań są identyczne jak
+    w ścieżce skalarnej.
+    Przy `double_hash=True` liczony jest drugi, niezależny hash (MOD2, BASE2);
+    kandydatem jest tylko okno zgodne w obu, co praktycznie eliminuje
+    fałszywe trafienia na długich tekstach o niskiej entropii.
     Zwraca:
       - matches: lista pozycji startowych
       - metrics: słownik z kluczami:
           'build_time', 'search_time', 'comparisons',
-          'memory_bytes', 'memory_per_char', 'time_per_pattern_char'
+          'memory_bytes', 'memory_per_char', 'time_per_pattern_char',
+          'spurious_hits' (zgodny hash, ale znaki się różnią)
     """
     m = len(pattern)
     n = len(text)
     total_pat_len = m
-    base = 256
-    mod = 10**9 + 7
+    base = BASE
+    mod = MOD
+    base2 = BASE2
+    mod2 = MOD2
+    if vectorized and np is None:
+        raise ImportError("search_rabin_karp(vectorized=True) wymaga pakietu numpy")
+    # dla pustego lub dłuższego od tekstu wzorca zostajemy przy ścieżce skalarnej
+    vectorized = vectorized and 0 < m <= n
 
     tracemalloc.start()
     base_current, base_peak = tracemalloc.get_traced_memory()
 
     # --- PREPROCESSING (hash pattern + pierwszy window) ---
     t0 = time.perf_counter()
-    pat_hash = 0
+    pat_hash = pat_hash2 = 0
     for ch in pattern:
         pat_hash = (pat_hash * base + ord(ch)) % mod
-    text_hash = 0
+        if double_hash:
+            pat_hash2 = (pat_hash2 * base2 + ord(ch)) % mod2
+    text_hash = text_hash2 = 0
     for i in range(min(m, n)):
         text_hash = (text_hash * base + ord(text[i])) % mod
+        if double_hash:
+            text_hash2 = (text_hash2 * base2 + ord(text[i])) % mod2
     h = pow(base, m-1, mod)
+    h2 = pow(base2, m-1, mod2)
     t1 = time.perf_counter()
     build_time = t1 - t0
 
@@ -35,10 +106,15 @@ def search_rabin_karp(text: str, pattern: str):
 
     # --- SEARCH ---
     comparisons = 0
+    spurious_hits = 0
     matches = []
     t2 = time.perf_counter()
-    for i in range(n - m + 1):
-        if text_hash == pat_hash:
+    if vectorized:
+        codes = _text_codes(text)
+        mask = _numpy_window_mask(codes, m, pat_hash, base, mod)
+        if double_hash:
+            mask &= _numpy_window_mask(codes, m, pat_hash2, base2, mod2)
+        for i in np.flatnonzero(mask).tolist():
             # weryfikujemy znaki
             match = True
             for j in range(m):
@@ -48,10 +124,117 @@ def search_rabin_karp(text: str, pattern: str):
                     break
             if match:
                 matches.append(i)
-        # update rolling hash
-        if i < n - m:
-            text_hash = (text_hash - ord(text[i]) * h) % mod
-            text_hash = (text_hash * base + ord(text[i+m])) % mod
+            else:
+                spurious_hits += 1
+    else:
+        for i in range(n - m + 1):
+            if text_hash == pat_hash and (not double_hash or text_hash2 == pat_hash2):
+                # weryfikujemy znaki
+                match = True
+                for j in range(m):
+                    comparisons += 1
+                    if text[i+j] != pattern[j]:
+                        match = False
+                        break
+                if match:
+                    matches.append(i)
+                else:
+                    spurious_hits += 1
+            # update rolling hash
+            if i < n - m:
+                text_hash = (text_hash - ord(text[i]) * h) % mod
+                text_hash = (text_hash * base + ord(text[i+m])) % mod
+                if double_hash:
+                    text_hash2 = (text_hash2 - ord(text[i]) * h2) % mod2
+                    text_hash2 = (text_hash2 * base2 + ord(text[i+m])) % mod2
+    t3 = time.perf_counter()
+    search_time = t3 - t2
+
+    curr_final, peak_final = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mem_used = peak_after_build - base_peak
+    mem_per_char = mem_used / n if n else 0
+    time_per_pat_char = search_time / total_pat_len if total_pat_len else 0
+
+    metrics = {
+        'build_time': build_time,
+        'search_time': search_time,
+        'comparisons': comparisons,
+        'memory_bytes': mem_used,
+        'memory_per_char': mem_per_char,
+        'time_per_pattern_char': time_per_pat_char,
+        'spurious_hits': spurious_hits
+    }
+    return matches, metrics
+
+def search_rabin_karp_multi(text: str, patterns: list):
+    """
+    Rabin–Karp dla wielu wzorców naraz: wzorce są grupowane po długości,
+    dla każdej różnej długości liczony jest jeden rolling hash tekstu,
+    a słownik hash -> wzorce wskazuje kandydatów do weryfikacji.
+    Koszt skanu: O(n × liczba różnych długości) zamiast O(n × liczba wzorców).
+    Zwraca:
+      - matches: lista (pozycja, (indeks_wzorca, wzorzec)) posortowana po pozycji
+      - metrics: słownik jak w `search_rabin_karp`
+    """
+    n = len(text)
+    total_pat_len = sum(len(p) for p in patterns)
+    base = BASE
+    mod = MOD
+
+    tracemalloc.start()
+    base_current, base_peak = tracemalloc.get_traced_memory()
+
+    # --- PREPROCESSING (hashe wzorców pogrupowane po długości) ---
+    t0 = time.perf_counter()
+    by_length = {}  # długość -> {hash: [(indeks_wzorca, wzorzec), ...]}
+    for idx, pattern in enumerate(patterns):
+        pat_hash = 0
+        for ch in pattern:
+            pat_hash = (pat_hash * base + ord(ch)) % mod
+        by_length.setdefault(len(pattern), {}).setdefault(pat_hash, []).append((idx, pattern))
+    t1 = time.perf_counter()
+    build_time = t1 - t0
+
+    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
+
+    # --- SEARCH: jeden rolling hash na każdą różną długość ---
+    comparisons = 0
+    spurious_hits = 0
+    matches = []
+    t2 = time.perf_counter()
+    for m, by_hash in by_length.items():
+        if m > n:
+            continue
+        if m == 0:
+            # pusty wzorzec pasuje na każdej pozycji
+            matches.extend((i, hit) for i in range(n + 1) for hit in by_hash[0])
+            continue
+        h = pow(base, m - 1, mod)
+        text_hash = 0
+        for i in range(m):
+            text_hash = (text_hash * base + ord(text[i])) % mod
+        for i in range(n - m + 1):
+            candidates = by_hash.get(text_hash)
+            if candidates is not None:
+                for idx, pattern in candidates:
+                    # weryfikujemy znaki
+                    match = True
+                    for j in range(m):
+                        comparisons += 1
+                        if text[i+j] != pattern[j]:
+                            match = False
+                            break
+                    if match:
+                        matches.append((i, (idx, pattern)))
+                    else:
+                        spurious_hits += 1
+            # update rolling hash
+            if i < n - m:
+                text_hash = (text_hash - ord(text[i]) * h) % mod
+                text_hash = (text_hash * base + ord(text[i+m])) % mod
+    matches.sort(key=lambda hit: (hit[0], hit[1][0]))
     t3 = time.perf_counter()
     search_time = t3 - t2
 
@@ -68,7 +251,8 @@ def search_rabin_karp(text: str, pattern: str):
         'comparisons': comparisons,
         'memory_bytes': mem_used,
         'memory_per_char': mem_per_char,
-        'time_per_pattern_char': time_per_pat_char
+        'time_per_pattern_char': time_per_pat_char,
+        'spurious_hits': spurious_hits
     }
     return matches, metrics
 
@@ -79,3 +263,6 @@ if __name__ == "__main__":
     hits, m = search_rabin_karp(txt, pat)
     print("Rabin–Karp → Pozycje:", hits)
     print("            Metryki:", m)
+    hits, m = search_rabin_karp_multi(txt, ["abra", "cad", "bra", "ra"])
+    print("Rabin–Karp (wiele wzorców) → Pozycje:", hits)
+    print("                            Metryki:", m)
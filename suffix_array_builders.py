@@ -0,0 +1,193 @@
+"""
+suffix_array_builders.py
+
+Budowa tablic sufiksów bez porównywania wycinków tekstu: liniowy SA-IS
+oraz zwektoryzowane podwajanie prefiksów w NumPy. Wynik to zwarta tablica
+liczb całkowitych (`array`), a nie lista obiektów int.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy potrzebny tylko dla build_suffix_array_numpy
+    np = None
+
+
+def _rank_alphabet(text):
+    """
+    Zamienia tekst (str lub ciąg liczb) na listę rang 0..k-1 zgodnych
+    z porządkiem znaków. Zwraca (rangi, k - 1).
+    """
+    alphabet = sorted(set(text))
+    rank = {ch: r for r, ch in enumerate(alphabet)}
+    return [rank[ch] for ch in text], len(alphabet) - 1
+
+
+def _sa_is(s, upper):
+    """
+    SA-IS (Nong, Zhang, Chan): sortowanie przez indukcję z rekurencją na
+    zredukowanym napisie pozycji LMS. `s` to lista liczb z zakresu
+    [0, upper]. Zwraca tablicę sufiksów jako listę. Czas i pamięć O(n).
+    """
+    n = len(s)
+    if n == 0:
+        return []
+    if n == 1:
+        return [0]
+    if n == 2:
+        return [0, 1] if s[0] < s[1] else [1, 0]
+
+    sa = [0] * n
+    # ls[i] == True  <=>  sufiks i jest typu S (mniejszy od sufiksu i + 1)
+    ls = [False] * n
+    for i in range(n - 2, -1, -1):
+        ls[i] = ls[i + 1] if s[i] == s[i + 1] else s[i] < s[i + 1]
+
+    # początki kubełków: sum_l[c] – pierwsza pozycja typu L znaku c,
+    # sum_s[c] – pierwsza pozycja typu S znaku c
+    sum_l = [0] * (upper + 1)
+    sum_s = [0] * (upper + 1)
+    for i in range(n):
+        if not ls[i]:
+            sum_s[s[i]] += 1
+        else:
+            sum_l[s[i] + 1] += 1
+    for c in range(upper + 1):
+        sum_s[c] += sum_l[c]
+        if c < upper:
+            sum_l[c + 1] += sum_s[c]
+
+    def induce(lms):
+        for i in range(n):
+            sa[i] = -1
+        buf = sum_s[:]
+        for d in lms:
+            if d == n:
+                continue
+            sa[buf[s[d]]] = d
+            buf[s[d]] += 1
+        buf = sum_l[:]
+        sa[buf[s[n - 1]]] = n - 1
+        buf[s[n - 1]] += 1
+        for i in range(n):
+            v = sa[i]
+            if v >= 1 and not ls[v - 1]:
+                sa[buf[s[v - 1]]] = v - 1
+                buf[s[v - 1]] += 1
+        buf = sum_l[:]
+        for i in range(n - 1, -1, -1):
+            v = sa[i]
+            if v >= 1 and ls[v - 1]:
+                buf[s[v - 1] + 1] -= 1
+                sa[buf[s[v - 1] + 1]] = v - 1
+
+    # pozycje LMS (S poprzedzone przez L) i ich numeracja
+    lms_map = [-1] * (n + 1)
+    lms = []
+    for i in range(1, n):
+        if not ls[i - 1] and ls[i]:
+            lms_map[i] = len(lms)
+            lms.append(i)
+    m = len(lms)
+
+    induce(lms)
+
+    if m:
+        sorted_lms = [v for v in sa if lms_map[v] != -1]
+        # nazywamy podnapisy LMS; równe podnapisy dostają tę samą nazwę
+        rec_s = [0] * m
+        rec_upper = 0
+        rec_s[lms_map[sorted_lms[0]]] = 0
+        for i in range(1, m):
+            left, right = sorted_lms[i - 1], sorted_lms[i]
+            end_l = lms[lms_map[left] + 1] if lms_map[left] + 1 < m else n
+            end_r = lms[lms_map[right] + 1] if lms_map[right] + 1 < m else n
+            same = True
+            if end_l - left != end_r - right:
+                same = False
+            else:
+                while left < end_l:
+                    if s[left] != s[right]:
+                        break
+                    left += 1
+                    right += 1
+                if left == n or s[left] != s[right]:
+                    same = False
+            if not same:
+                rec_upper += 1
+            rec_s[lms_map[sorted_lms[i]]] = rec_upper
+
+        rec_sa = _sa_is(rec_s, rec_upper)
+        for i in range(m):
+            sorted_lms[i] = lms[rec_sa[i]]
+        induce(sorted_lms)
+    return sa
+
+
+def _int_array(values, n):
+    """Tablica int32, a dla tekstów dłuższych niż 2^31 - 1 – int64."""
+    return array('i' if n < 2**31 else 'q', values)
+
+
+def build_suffix_array_sais(text):
+    """
+    Tablica sufiksów dla `text` (str lub ciąg porównywalnych symboli)
+    zbudowana algorytmem SA-IS w czasie O(n).
+    Zwraca `array('i')` (lub `array('q')` dla bardzo długich tekstów) –
+    ten sam porządek co `sorted(range(n), key=lambda i: text[i:])`.
+    """
+    s, upper = _rank_alphabet(text)
+    return _int_array(_sa_is(s, upper), len(s))
+
+
+def build_suffix_array_numpy(text):
+    """
+    Tablica sufiksów przez podwajanie prefiksów (prefix doubling) w NumPy.
+    W każdej rundzie para rang (rank[i], rank[i + k]) jest pakowana w jeden
+    klucz int64 i sortowana stabilnym argsortem (stabilne sortowanie przez
+    porównania – timsort/mergesort w NumPy), a nowe rangi liczone są
+    wektorowo przez cumsum – bez krotek i pętli w Pythonie. Zwraca ten sam porządek co `build_suffix_array_sais`.
+    """
+    if np is None:
+        raise ImportError("build_suffix_array_numpy wymaga pakietu numpy")
+    n = len(text)
+    if n == 0:
+        return _int_array([], 0)
+    if isinstance(text, str):
+        if text.isascii():
+            codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        else:
+            # surrogatepass: kody równe `ord` także dla samotnych surogatów
+            codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    else:
+        codes = np.asarray(text)
+    rank_type = np.int32 if n < 2**31 else np.int64
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64)
+    k = 1
+    while True:
+        # rank drugiej połowy; -1 (tu: 0 po przesunięciu) dla sufiksów krótszych niż k
+        second = np.zeros(n, dtype=np.int64)
+        if k < n:
+            second[:n - k] = rank[k:] + 1
+        key = rank * (n + 1) + second
+        sa = np.argsort(key, kind='stable')
+        sorted_key = key[sa]
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        rank = new_rank
+        if rank[sa[-1]] == n - 1:
+            break
+        k <<= 1
+    result = array('i' if rank_type is np.int32 else 'q')
+    result.frombytes(sa.astype(rank_type).tobytes())
+    return result
+
+
+# ---- PRZYKŁAD UŻYCIA ----
+if __name__ == "__main__":
+    txt = "abracadabra"
+    print("SA-IS →", list(build_suffix_array_sais(txt)))
+    if np is not None:
+        print("NumPy →", list(build_suffix_array_numpy(txt)))
@@ -0,0 +1,342 @@
+"""
+suffix_array_index.py
+
+Trwały indeks tablicy sufiksów: build(text) → save(path) → open(path).
+Tekst (kody znaków) i tablica sufiksów są zapisywane jako tablice int32/int64
+little-endian, a przy otwarciu mapowane przez `mmap` – zapytania działają
+bezpośrednio na zmapowanym pliku, bez przebudowy i bez list intów Pythona.
+Indeks udostępnia też tablicę LCP z RMQ, czyli zapytania LCE(i, j) w O(1).
+"""
+
+import mmap
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+
+from suffix_array_builders import build_suffix_array_sais
+from sufiksowe_wzorce import (SA_SEARCH_MODES, SparseTable, _sa_range,
+                              _sa_range_mlr, build_lcp, build_llcp_rlcp)
+
+# Format (little-endian): nagłówek `_HEADER` (magic, wersja, n, rozmiar
+# elementu SA), kody znaków tekstu jako int32, wyrównanie do 8 bajtów,
+# tablica sufiksów jako int32 lub int64.
+_MAGIC = b'SAIX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIQI4x')
+
+
+def _aligned(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _mapped_array(mm, start, count, typecode):
+    """
+    Widok `count` liczb typu `typecode` od bajtu `start` zmapowanego pliku.
+    Na maszynach big-endian – kopia z zamienioną kolejnością bajtów.
+    """
+    view = memoryview(mm)[start:start + count * array(typecode).itemsize]
+    if sys.byteorder == 'little':
+        return view.cast(typecode)
+    values = array(typecode)
+    values.frombytes(view)
+    view.release()
+    values.byteswap()
+    return values
+
+
+class SuffixArrayIndex:
+    """
+    Indeks tablicy sufiksów dla jednego tekstu. Tworzony przez `build`
+    (w pamięci) albo `open` (zmapowany plik zapisany wcześniej przez `save`).
+    """
+
+    def __init__(self, text, sa, mm=None, build_time=0.0):
+        self.text = text              # kody znaków (int32)
+        self.sa = sa                  # tablica sufiksów (int32 / int64)
+        self.build_time = build_time  # czas budowy albo otwarcia indeksu
+        self._mmap = mm
+        self._lcp = None              # tablica LCP (Kasai), liczona przy pierwszym użyciu
+        self._llcp_rlcp = None        # tablice LLCP/RLCP, liczone przy pierwszym użyciu
+        self._rank = None             # odwrotność tablicy sufiksów (dla `lce`)
+        self._rmq = None              # SparseTable nad `lcp` (dla `lce`)
+
+    @classmethod
+    def build(cls, text: str):
+        """Buduje indeks dla `text` algorytmem SA-IS."""
+        t0 = time.perf_counter()
+        codes = array('i', map(ord, text))
+        sa = build_suffix_array_sais(codes)
+        return cls(codes, sa, build_time=time.perf_counter() - t0)
+
+    def save(self, path):
+        """Zapisuje tekst i tablicę sufiksów w zwartym formacie binarnym."""
+        n = len(self.text)
+        sa = array('i' if n < 2**31 else 'q', self.sa)
+        text = array('i', self.text)
+        if sys.byteorder != 'little':
+            sa.byteswap()
+            text.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, n, sa.itemsize))
+            text.tofile(f)
+            f.write(bytes(_aligned(f.tell()) - f.tell()))
+            sa.tofile(f)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Otwiera indeks zapisany przez `save`, mapując plik przez `mmap`
+        (tylko do odczytu). Nic nie jest przebudowywane ani kopiowane.
+        """
+        t0 = time.perf_counter()
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, itemsize = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC:
+            mm.close()
+            raise ValueError(f"{path}: to nie jest plik indeksu tablicy sufiksów")
+        if version != _VERSION:
+            mm.close()
+            raise ValueError(f"{path}: nieobsługiwana wersja formatu {version}")
+        text_start = _HEADER.size
+        sa_start = _aligned(text_start + 4 * n)
+        text = _mapped_array(mm, text_start, n, 'i')
+        sa = _mapped_array(mm, sa_start, n, 'i' if itemsize == 4 else 'q')
+        return cls(text, sa, mm, build_time=time.perf_counter() - t0)
+
+    def close(self):
+        """Zwalnia zmapowany plik (dla indeksu z `open`)."""
+        if self._mmap is None:
+            return
+        for values in (self.text, self.sa):
+            if isinstance(values, memoryview):
+                values.release()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def lcp(self):
+        """
+        Tablica LCP: lcp[i] = długość wspólnego prefiksu sufiksów sa[i]
+        i sa[i + 1]. Liczona algorytmem Kasai przy pierwszym dostępie.
+        """
+        if self._lcp is None:
+            self._lcp = build_lcp(self.text, self.sa)
+        return self._lcp
+
+    def lce(self, i: int, j: int) -> int:
+        """
+        Longest common extension: długość najdłuższego wspólnego prefiksu
+        sufiksów text[i:] i text[j:] w O(1) – minimum tablicy LCP między ich
+        pozycjami w tablicy sufiksów. Ranga i tablica rzadka RMQ są budowane
+        przy pierwszym wywołaniu (O(n log n)).
+        """
+        n = len(self.text)
+        if not (0 <= i < n and 0 <= j < n):
+            raise IndexError(f"lce: pozycje poza tekstem ({i}, {j}), n = {n}")
+        if i == j:
+            return n - i
+        if self._rmq is None:
+            rank = array('i', [0]) * n
+            for r, pos in enumerate(self.sa):
+                rank[pos] = r
+            self._rank = rank
+            self._rmq = SparseTable(self.lcp)
+        a, b = self._rank[i], self._rank[j]
+        if a > b:
+            a, b = b, a
+        return self._rmq.query(a, b)
+
+    def _range(self, pattern: str, search_mode: str):
+        codes = [ord(ch) for ch in pattern]
+        if search_mode == 'plain':
+            return _sa_range(self.text, self.sa, codes)
+        if search_mode == 'mlr':
+            return _sa_range_mlr(self.text, self.sa, codes)
+        if search_mode == 'lcp':
+            if self._llcp_rlcp is None:
+                self._llcp_rlcp = build_llcp_rlcp(self.lcp, len(self.sa))
+            return _sa_range_mlr(self.text, self.sa, codes, *self._llcp_rlcp)
+        raise ValueError(f"Nieznany tryb wyszukiwania: {search_mode!r} "
+                         f"(dostępne: {', '.join(SA_SEARCH_MODES)})")
+
+    def find(self, pattern: str, search_mode: str = 'mlr') -> list:
+        """Pozycje wszystkich wystąpień `pattern` (w kolejności tablicy sufiksów)."""
+        left, right, _ = self._range(pattern, search_mode)
+        return list(self.sa[left:right])
+
+    def count(self, pattern: str, search_mode: str = 'mlr') -> int:
+        """Liczba wystąpień `pattern` – bez materializowania pozycji."""
+        left, right, _ = self._range(pattern, search_mode)
+        return right - left
+
+    def search(self, pattern: str, search_mode: str = 'mlr'):
+        """
+        Zapytanie z metrykami jak w `search_suffix_array`; indeks jest już
+        zbudowany, więc 'build_time' wynosi 0, a 'memory_bytes' to pamięć
+        zaalokowana przez samo zapytanie. `search_mode` jak w
+        `search_suffix_array` ('lcp' liczy LLCP/RLCP przy pierwszym użyciu).
+        """
+        n, m = len(self.text), len(pattern)
+
+        tracemalloc.start()
+        base_current, base_peak = tracemalloc.get_traced_memory()
+
+        t2 = time.perf_counter()
+        left, right, comparisons = self._range(pattern, search_mode)
+        matches = list(self.sa[left:right])
+        t3 = time.perf_counter()
+        search_time = t3 - t2
+
+        curr_final, peak_final = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        mem_used = peak_final - base_peak
+        metrics = {
+            'build_time': 0.0,
+            'search_time': search_time,
+            'comparisons': comparisons,
+            'memory_bytes': mem_used,
+            'memory_per_char': mem_used / n if n else 0,
+            'time_per_pattern_char': search_time / m if m else 0
+        }
+        return matches, metrics
+
+    def _find_many(self, patterns):
+        """
+        Zapytania wsadowe bez metryk. Wzorce są sortowane, a każdy kolejny
+        szukany jest tylko w przedziale wyznaczonym przez wcześniejsze wyniki:
+          - stos trzyma przedziały wzorców będących prefiksami bieżącego –
+            zapytanie ogranicza się do przedziału najgłębszego z nich i pomija
+            porównanie jego `depth` pierwszych znaków,
+          - jeśli poprzedni wzorzec nie jest prefiksem bieżącego, wszystkie
+            wystąpienia bieżącego leżą za przedziałem poprzedniego.
+        Zwraca (results, comparisons): results[i] to lista pozycji dla
+        patterns[i] (w kolejności tablicy sufiksów).
+        """
+        n = len(self.text)
+        results = [None] * len(patterns)
+        comparisons = 0
+        stack = []  # (depth, left, right) – przedziały prefiksów bieżącego wzorca
+        prev = None
+        prev_range = (0, 0)
+        for idx in sorted(range(len(patterns)), key=patterns.__getitem__):
+            codes = [ord(ch) for ch in patterns[idx]]
+            if codes == prev:
+                left, right = prev_range
+            else:
+                common = 0
+                if prev is not None:
+                    limit = min(len(prev), len(codes))
+                    while common < limit and prev[common] == codes[common]:
+                        common += 1
+                while stack and stack[-1][0] > common:
+                    stack.pop()
+                skip, lo, hi = stack[-1] if stack else (0, 0, n)
+                if prev is not None and common < len(prev):
+                    lo = max(lo, prev_range[1])
+                left, right, comps = _sa_range_mlr(self.text, self.sa, codes,
+                                                   lo=lo, hi=hi, skip=skip)
+                comparisons += comps
+                stack.append((len(codes), left, right))
+                prev, prev_range = codes, (left, right)
+            results[idx] = list(self.sa[left:right])
+        return results, comparisons
+
+    def search_many(self, patterns):
+        """
+        Zapytania wsadowe (`_find_many`) z metrykami. Zwraca (results, metrics):
+        results[i] to lista pozycji dla patterns[i] (w kolejności tablicy
+        sufiksów), metrics jak w `search` dla całej partii.
+        """
+        n = len(self.text)
+        total_pat_len = sum(len(p) for p in patterns)
+
+        tracemalloc.start()
+        base_current, base_peak = tracemalloc.get_traced_memory()
+
+        t2 = time.perf_counter()
+        results, comparisons = self._find_many(patterns)
+        t3 = time.perf_counter()
+        search_time = t3 - t2
+
+        curr_final, peak_final = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        mem_used = peak_final - base_peak
+        metrics = {
+            'build_time': 0.0,
+            'search_time': search_time,
+            'comparisons': comparisons,
+            'memory_bytes': mem_used,
+            'memory_per_char': mem_used / n if n else 0,
+            'time_per_pattern_char': search_time / total_pat_len if total_pat_len else 0
+        }
+        return results, metrics
+
+
+def benchmark_search_many(text_len: int = 100_000, n_patterns: int = 10_000):
+    """
+    Przepustowość: zapytanie wsadowe na całej partii vs pętla zapytań
+    pojedynczych (obie na tym samym, raz zbudowanym indeksie). Obie strony
+    mierzone są bez tracemalloc i słowników metryk (`_range` + wycinek
+    oraz `_find_many`), więc wykonują tę samą pracę.
+    Zwraca (czas_pętli, czas_partii, porównania_pętli, porównania_partii).
+    """
+    import random
+    import string
+
+    random.seed(0)
+    text = ''.join(random.choices(string.ascii_lowercase[:4], k=text_len))
+    patterns = []
+    for _ in range(n_patterns):
+        start = random.randrange(text_len - 12)
+        patterns.append(text[start:start + random.randint(4, 12)])
+    index = SuffixArrayIndex.build(text)
+
+    t0 = time.perf_counter()
+    single = []
+    loop_comps = 0
+    for p in patterns:
+        left, right, comps = index._range(p, 'mlr')
+        single.append(list(index.sa[left:right]))
+        loop_comps += comps
+    loop_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch, batch_comps = index._find_many(patterns)
+    batch_time = time.perf_counter() - t0
+
+    assert batch == single
+    return loop_time, batch_time, loop_comps, batch_comps
+
+
+# ---- Przykład użycia ----
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    index = SuffixArrayIndex.build("abracadabra")
+    path = os.path.join(tempfile.gettempdir(), "abracadabra.saix")
+    index.save(path)
+    with SuffixArrayIndex.open(path) as mapped:
+        hits, m = mapped.search("abra")
+        print("SuffixArrayIndex → Pozycje:", hits)
+        print("                   Metryki:", m)
+        print("LCE(0, 7) =", mapped.lce(0, 7))
+    os.remove(path)
+
+    loop_time, batch_time, loop_comps, batch_comps = benchmark_search_many()
+    print(f"pętla find  : {loop_time:.3f} s, {loop_comps} porównań")
+    print(f"partia      : {batch_time:.3f} s, {batch_comps} porównań")
@@ -1,35 +1,25 @@
 import time
 import tracemalloc
+from array import array
 
-def search_suffix_array(text: str, pattern: str):
+from suffix_array_builders import build_suffix_array_sais
+
+# sposoby budowy tablicy sufiksów dostępne w `search_suffix_array`
+SA_BUILDERS = {
+    # sortowanie wycinków: O(n² log n) czasu i O(n²) pamięci szczytowo
+    'sort': lambda text: sorted(range(len(text)), key=lambda i: text[i:]),
+    # SA-IS: O(n), wynik jako zwarta tablica int
+    'sais': build_suffix_array_sais,
+}
+
+def _sa_range(text, sa, pattern):
     """
-    Przeszukuje `text` za pomocą suffix array + binary search.
-    Zwraca:
-      - matches: lista pozycji startowych dopasowań
-      - metrics: słownik z kluczami:
-          'build_time'           – czas budowy tablicy sufiksów,
-          'search_time'          – czas wyszukiwania (dwa bin-search),
-          'comparisons'          – liczba porównań znaków w fazie wyszukiwania,
-          'memory_bytes'         – zużycie pamięci na strukturę (peak_build – peak_base),
-          'memory_per_char'      – pamięć na znak tekstu,
-          'time_per_pattern_char'– czas wyszukiwania / długość wzorca.
+    Dwa wyszukiwania binarne w tablicy sufiksów `sa` tekstu `text`.
+    `text` i `pattern` mogą być napisami albo ciągami kodów znaków
+    (np. tablicą zmapowaną z pliku) – byle tego samego rodzaju.
+    Zwraca (left, right, comparisons): sa[left:right] to wszystkie wystąpienia.
     """
     n, m = len(text), len(pattern)
-    total_pat_len = m
-
-    # --- Pomiar pamięci przed buildem ---
-    tracemalloc.start()
-    base_current, base_peak = tracemalloc.get_traced_memory()
-
-    # --- Budowa suffix array ---
-    t0 = time.perf_counter()
-    sa = sorted(range(n), key=lambda i: text[i:])  # lista indeksów początków sufiksów
-    t1 = time.perf_counter()
-    build_time = t1 - t0
-
-    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
-
-    # --- Przygotowanie do wyszukiwania ---
     comparisons = 0
 
     def _cmp_suffix(i: int) -> int:
@@ -51,11 +41,8 @@ def search_suffix_array(text: str, pattern: str):
                 return 1
         return 0
 
-    # --- Wyszukiwanie (dwa bin-search dla [left, right) w sa) ---
-    t2 = time.perf_counter()
-
     # lewy kraniec przedziału dopasowań
-    lo, hi = 0, n
+    lo, hi = 0, len(sa)
     while lo < hi:
         mid = (lo + hi) // 2
         if _cmp_suffix(sa[mid]) < 0:
@@ -65,7 +52,7 @@ def search_suffix_array(text: str, pattern: str):
     left = lo
 
     # prawy kraniec
-    lo, hi = 0, n
+    lo, hi = 0, len(sa)
     while lo < hi:
         mid = (lo + hi) // 2
         if _cmp_suffix(sa[mid]) <= 0:
@@ -74,7 +61,220 @@ def search_suffix_array(text: str, pattern: str):
             hi = mid
     right = lo
 
-    matches = sa[left:right]
+    return left, right, comparisons
+
+def build_lcp(text, sa):
+    """
+    Tablica LCP algorytmem Kasai, O(n): lcp[i] to długość najdłuższego
+    wspólnego prefiksu sufiksów sa[i] i sa[i + 1] (długość n - 1).
+    """
+    n = len(text)
+    rank = [0] * n
+    for i, pos in enumerate(sa):
+        rank[pos] = i
+    lcp = array('i', [0]) * max(n - 1, 0)
+    h = 0
+    for i in range(n):
+        if rank[i] > 0:
+            j = sa[rank[i] - 1]
+            while i + h < n and j + h < n and text[i + h] == text[j + h]:
+                h += 1
+            lcp[rank[i] - 1] = h
+            if h:
+                h -= 1
+        else:
+            h = 0
+    return lcp
+
+class SparseTable:
+    """
+    Tablica rzadka (sparse table) dla zapytań o minimum na przedziale (RMQ):
+    levels[k][i] = min(values[i:i + 2^k]). Budowa O(n log n) czasu i pamięci,
+    zapytanie `query(lo, hi)` = min(values[lo:hi]) w O(1) – dwa nakładające
+    się przedziały długości 2^k.
+    """
+
+    __slots__ = ('levels',)
+
+    def __init__(self, values):
+        level = array('i', values)
+        self.levels = [level]
+        half = 1
+        while half < len(level):
+            level = array('i', map(min, level[:len(level) - half], level[half:]))
+            self.levels.append(level)
+            half <<= 1
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    def query(self, lo: int, hi: int) -> int:
+        """Minimum z values[lo:hi] (wymaga 0 <= lo < hi <= len)."""
+        k = (hi - lo).bit_length() - 1
+        level = self.levels[k]
+        a, b = level[lo], level[hi - (1 << k)]
+        return a if a < b else b
+
+def build_llcp_rlcp(lcp, n):
+    """
+    Tablice LLCP/RLCP (Manber–Myers) dla przedziałów wyszukiwania binarnego
+    (L, R) zaczynającego od (0, n - 1) ze środkiem M = (L + R) // 2:
+    llcp[M] = lcp(sa[L], sa[M]), rlcp[M] = lcp(sa[M], sa[R]). Czas O(n).
+    """
+    llcp = array('i', [0]) * n
+    rlcp = array('i', [0]) * n
+    if n < 3:
+        return llcp, rlcp
+    # post-order po drzewie przedziałów; wynik przedziału = min(lcp[L:R])
+    result = {}
+    stack = [(0, n - 1, False)]
+    while stack:
+        L, R, done = stack.pop()
+        if R - L == 1:
+            result[L, R] = lcp[L]
+            continue
+        M = (L + R) // 2
+        if not done:
+            stack.append((L, R, True))
+            stack.append((L, M, False))
+            stack.append((M, R, False))
+            continue
+        llcp[M] = result.pop((L, M))
+        rlcp[M] = result.pop((M, R))
+        result[L, R] = min(llcp[M], rlcp[M])
+    return llcp, rlcp
+
+def _sa_range_mlr(text, sa, pattern, llcp=None, rlcp=None, lo=0, hi=None, skip=0):
+    """
+    Wyszukiwanie Manbera–Myersa: pamięta lcp wzorca z lewą (l) i prawą (r)
+    granicą przedziału i zaczyna porównanie od min(l, r) zamiast od zera.
+    Z tablicami `llcp`/`rlcp` (z `build_llcp_rlcp`) każdy krok przesuwa się
+    bez porównań, gdy lcp granicy ze środkiem rozstrzyga wynik – łącznie
+    O(m + log n) porównań znaków.
+    `lo`, `hi` zawężają wyszukiwanie do sa[lo:hi], o którym wiadomo, że
+    wszystkie jego sufiksy zgadzają się ze wzorcem na pierwszych `skip`
+    znakach (LLCP/RLCP dotyczą tylko pełnego przedziału i są wtedy pomijane).
+    Zwraca (left, right, comparisons) jak `_sa_range`.
+    """
+    if hi is None:
+        hi = len(sa)
+    if (lo, hi) != (0, len(sa)):
+        llcp = rlcp = None
+    m = len(pattern)
+    tlen = len(text)
+    comparisons = 0
+
+    def _cmp_from(i: int, k: int):
+        """
+        Porównuje text[i:] z pattern, wiedząc, że pierwsze k znaków się zgadza.
+        Zwraca (wynik jak w _sa_range, długość wspólnego prefiksu).
+        """
+        nonlocal comparisons
+        for j in range(k, m):
+            comparisons += 1
+            if i + j >= tlen or text[i + j] < pattern[j]:
+                return -1, j
+            if text[i + j] > pattern[j]:
+                return 1, j
+        return 0, m
+
+    def _bound(upper: bool) -> int:
+        # upper=False: pierwszy sufiks >= wzorzec; upper=True: pierwszy sufiks > wzorzec
+        # "po prawej" oznacza: sufiks > wzorzec (upper) albo sufiks >= wzorzec
+        def right_side(c):
+            return c > 0 if upper else c >= 0
+
+        c, l = _cmp_from(sa[lo], skip)
+        if right_side(c):
+            return lo
+        c, r = _cmp_from(sa[hi - 1], skip)
+        if not right_side(c):
+            return hi
+        L, R = lo, hi - 1  # sa[L] po lewej, sa[R] po prawej stronie granicy
+        while R - L > 1:
+            M = (L + R) // 2
+            if llcp is not None and l >= r and llcp[M] != l:
+                if llcp[M] > l:
+                    L = M
+                else:
+                    R, r = M, llcp[M]
+                continue
+            if rlcp is not None and r > l and rlcp[M] != r:
+                if rlcp[M] > r:
+                    R = M
+                else:
+                    L, l = M, rlcp[M]
+                continue
+            # z tablicami: lcp(sa[M], wzorzec) >= max(l, r), gdy llcp[M] == l
+            # (l >= r) lub rlcp[M] == r (r > l) – nie porównujemy tego ponownie
+            start = max(l, r) if llcp is not None else min(l, r)
+            c, k = _cmp_from(sa[M], start)
+            if right_side(c):
+                R, r = M, k
+            else:
+                L, l = M, k
+        return R
+
+    if lo >= hi:
+        return lo, lo, 0
+    left = _bound(False)
+    right = _bound(True)
+    return left, right, comparisons
+
+# tryby wyszukiwania w tablicy sufiksów
+SA_SEARCH_MODES = ('plain', 'mlr', 'lcp')
+
+def search_suffix_array(text: str, pattern: str, builder: str = 'sort',
+                        search_mode: str = 'plain'):
+    """
+    Przeszukuje `text` za pomocą suffix array + binary search.
+    `builder` wybiera sposób budowy tablicy (klucz z `SA_BUILDERS`):
+    'sort' – sortowanie sufiksów, 'sais' – liniowy SA-IS.
+    `search_mode` wybiera wyszukiwanie:
+      - 'plain' – dwa zwykłe bin-search, każde porównanie od początku wzorca,
+      - 'mlr'   – Manber–Myers: porównanie od min(lcp z lewą, lcp z prawą granicą),
+      - 'lcp'   – jak 'mlr' plus tablice LLCP/RLCP liczone przy budowie,
+                  O(m + log n) porównań na zapytanie.
+    Zwraca:
+      - matches: lista pozycji startowych dopasowań
+      - metrics: słownik z kluczami:
+          'build_time'           – czas budowy tablicy sufiksów,
+          'search_time'          – czas wyszukiwania (dwa bin-search),
+          'comparisons'          – liczba porównań znaków w fazie wyszukiwania,
+          'memory_bytes'         – zużycie pamięci na strukturę (peak_build – peak_base),
+          'memory_per_char'      – pamięć na znak tekstu,
+          'time_per_pattern_char'– czas wyszukiwania / długość wzorca.
+    """
+    if builder not in SA_BUILDERS:
+        raise ValueError(f"Nieznany builder: {builder!r} (dostępne: {', '.join(SA_BUILDERS)})")
+    if search_mode not in SA_SEARCH_MODES:
+        raise ValueError(f"Nieznany tryb wyszukiwania: {search_mode!r} "
+                         f"(dostępne: {', '.join(SA_SEARCH_MODES)})")
+    n, m = len(text), len(pattern)
+    total_pat_len = m
+
+    # --- Pomiar pamięci przed buildem ---
+    tracemalloc.start()
+    base_current, base_peak = tracemalloc.get_traced_memory()
+
+    # --- Budowa suffix array ---
+    t0 = time.perf_counter()
+    sa = SA_BUILDERS[builder](text)  # indeksy początków sufiksów w porządku leksykograficznym
+    llcp = rlcp = None
+    if search_mode == 'lcp':
+        llcp, rlcp = build_llcp_rlcp(build_lcp(text, sa), n)
+    t1 = time.perf_counter()
+    build_time = t1 - t0
+
+    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
+
+    # --- Wyszukiwanie (dwa bin-search dla [left, right) w sa) ---
+    t2 = time.perf_counter()
+    if search_mode == 'plain':
+        left, right, comparisons = _sa_range(text, sa, pattern)
+    else:
+        left, right, comparisons = _sa_range_mlr(text, sa, pattern, llcp, rlcp)
+    matches = list(sa[left:right])
 
     t3 = time.perf_counter()
     search_time = t3 - t2
@@ -105,3 +305,15 @@ if __name__ == "__main__":
     hits, m = search_suffix_array(txt, pat)
     print("Suffix Array → Pozycje:", hits)
     print("                Metryki:", m)
+
+    # najgorszy przypadek dla wyszukiwania bez LLCP/RLCP: 128 bloków X + unikalny
+    # znak, wzorzec X + znak spoza tekstu – wszystkie sufiksy bloków mają
+    # długi wspólny prefiks ze wzorcem
+    import random
+    random.seed(0)
+    block = ''.join(random.choices('ab', k=800))
+    txt = ''.join(block + chr(0x100 + i) for i in range(128))
+    pat = block + chr(0x10000)
+    for mode in SA_SEARCH_MODES:
+        _, m = search_suffix_array(txt, pat, builder='sais', search_mode=mode)
+        print(f"najgorszy przypadek, {mode:<5} → porównania: {m['comparisons']}")
@@ -1,10 +1,62 @@
 import time
 import tracemalloc
 
-def search_z(text: str, pattern: str):
+from kmp_algorithm import STREAM_CHUNK_SIZE, KMPPattern
+
+def _z_array(s):
+    """
+    Tablica Z dla `s`: Z[i] = długość najdłuższego wspólnego prefiksu
+    s i s[i:] (Z[0] = len(s)).
+    """
+    L = len(s)
+    Z = [0] * L
+    if L:
+        Z[0] = L
+    l = r = 0  # [l, r) – najdalej sięgające okno zgodne z prefiksem
+    for i in range(1, L):
+        if i < r:
+            Z[i] = min(r - i, Z[i - l])
+        while i + Z[i] < L and s[Z[i]] == s[i + Z[i]]:
+            Z[i] += 1
+        if i + Z[i] > r:
+            l, r = i, i + Z[i]
+    return Z
+
+def _failure_from_z(Z):
+    """
+    Zamienia tablicę Z wzorca na (silną) funkcję prefiksową w stylu KMP
+    (Gusfield): fail[j + Z[j] - 1] = Z[j], od największego j do najmniejszego.
+    """
+    m = len(Z)
+    fail = [0] * m
+    for j in range(m - 1, 0, -1):
+        if Z[j]:
+            fail[j + Z[j] - 1] = Z[j]
+    return fail
+
+class ZPattern(KMPPattern):
+    """
+    Wzorzec dla strumieniowego Z-algorytmu: tablica przejść liczona z tablicy
+    Z wzorca (`_failure_from_z`), a dopasowanie i tryb strumieniowy to ten
+    sam automat co w `KMPPattern`.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def _failure_table(pattern):
+        return _failure_from_z(_z_array(pattern))
+
+    def _with_pattern(self, pattern):
+        return ZPattern(pattern)
+
+def search_z(text: str, pattern: str, streaming: bool = False):
     """
     Z-algorytm: łączy pattern+'$'+text, buduje tablicę Z,
     dopasowania tam, gdzie Z[i] == len(pattern).
+    Przy `streaming=True` tablica Z liczona jest tylko dla wzorca (O(m)
+    pamięci), a tekst jest przeglądany jednoprzebiegowo jak w matcherze –
+    bez sklejania napisów i bez znaku-wartownika, więc '$' w tekście
+    nie przeszkadza.
     Zwraca:
       - matches: lista pozycji startowych
       - metrics: słownik z kluczami:
@@ -15,6 +67,9 @@ def search_z(text: str, pattern: str):
     n = len(text)
     total_pat_len = m
 
+    if streaming:
+        return _search_z_streaming(text, pattern)
+
     tracemalloc.start()
     base_current, base_peak = tracemalloc.get_traced_memory()
 
@@ -78,6 +133,54 @@ def search_z(text: str, pattern: str):
     }
     return matches, metrics
 
+def _search_z_streaming(text: str, pattern: str):
+    m = len(pattern)
+    n = len(text)
+    total_pat_len = m
+
+    tracemalloc.start()
+    base_current, base_peak = tracemalloc.get_traced_memory()
+
+    # --- BUDOWA: tablica Z samego wzorca ---
+    t0 = time.perf_counter()
+    compiled = ZPattern(pattern)
+    t1 = time.perf_counter()
+    build_time = t1 - t0
+
+    curr_after_build, peak_after_build = tracemalloc.get_traced_memory()
+
+    matches = []
+    t2 = time.perf_counter()
+    _, comparisons = compiled._scan(text, matches)
+    t3 = time.perf_counter()
+    search_time = t3 - t2
+
+    curr_final, peak_final = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mem_used = peak_after_build - base_peak
+    mem_per_char = mem_used / n if n else 0
+    time_per_pat_char = search_time / total_pat_len if total_pat_len else 0
+
+    metrics = {
+        'build_time': build_time,
+        'search_time': search_time,
+        'comparisons': comparisons,
+        'memory_bytes': mem_used,
+        'memory_per_char': mem_per_char,
+        'time_per_pattern_char': time_per_pat_char
+    }
+    return matches, metrics
+
+def search_z_stream(source, pattern, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Z-algorytm w trybie strumieniowym: plik (tekstowy lub binarny) albo
+    dowolny iterable kawałków. Stan dopasowania przechodzi między kawałkami,
+    pamięć poza bieżącym kawałkiem to O(m). Leniwie zwraca bezwzględne
+    pozycje wystąpień (dla danych binarnych wzorzec `str` kodowany w UTF-8).
+    """
+    return ZPattern(pattern).finditer_stream(source, chunk_size)
+
 # ---- PRZYKŁADOWE UŻYCIE ----
 if __name__ == "__main__":
     txt = "abracadabra"
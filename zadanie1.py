@@ -1,10 +1,17 @@
+from array import array
+
+
 class Node:
+    __slots__ = ('children', 'suffix_link', 'start', 'end', 'suffix_index', 'lo', 'hi')
+
     def __init__(self, start=-1, end=-1):
         self.children = {}  # Słownik przechowujący dzieci: znak -> Node
         self.suffix_link = None  # Łącze sufiksowe (reguła łącza sufiksowego)
         self.start = start  # Indeks początkowy etykiety krawędzi w tekście
         self.end = end  # Indeks końcowy (dla liści to wskaźnik końcowy – może być zmieniany)
         self.suffix_index = -1  # Numer sufiksu (ustawiany przy DFS po zakończeniu budowy drzewa)
+        self.lo = 0  # Przedział [lo, hi) liści poddrzewa w SuffixTree.leaves (ustawiany po budowie)
+        self.hi = 0
 
 
 class SuffixTree:
@@ -25,7 +32,8 @@ class SuffixTree:
         self.last_new_node = None  # ostatni utworzony węzeł wewnętrzny, który oczekuje ustawienia łącza sufiksowego
         self.leaf_end = -1  # globalny wskaźnik końcowy dla wszystkich liści
         self.build_tree()
-        self._set_suffix_index(self.root, 0)
+        self.leaves = array('i')  # indeksy sufiksów liści w kolejności DFS
+        self._index_leaves()
 
     def edge_length(self, node: Node, current_pos: int) -> int:
         """
@@ -111,28 +119,36 @@ class SuffixTree:
             elif self.active_node != self.root:
                 self.active_node = self.active_node.suffix_link if self.active_node.suffix_link is not None else self.root
 
-    def _set_suffix_index(self, node: Node, label_length: int):
+    def _index_leaves(self):
         """
-        Przechodzi przez drzewo sufiksów (DFS) i ustawia końcowy indeks sufiksu dla liści.
-        Dzięki temu mamy bezpośrednio zapamiętane pozycje wystąpień sufiksów.
+        Iteracyjny DFS po zakończeniu budowy drzewa (bez rekurencji, więc bez
+        limitu głębokości): ustawia indeks sufiksu w liściach i zapisuje je
+        w kolejności DFS do jednej tablicy `self.leaves`. Każdy węzeł dostaje
+        przedział [lo, hi) tej tablicy – liście jego poddrzewa.
         """
-        if len(node.children) == 0:
-            node.suffix_index = self.size - label_length
-            return
-        for child in node.children.values():
-            edge_len = (min(child.end, self.size) - child.start)
-            self._set_suffix_index(child, label_length + edge_len)
-
-    def find_pattern(self, pattern: str) -> list:
+        leaves = array('i')
+        stack = [(self.root, 0, False)]
+        while stack:
+            node, label_length, done = stack.pop()
+            if done:
+                node.hi = len(leaves)
+                continue
+            node.lo = len(leaves)
+            if len(node.children) == 0:
+                node.suffix_index = self.size - label_length
+                leaves.append(node.suffix_index)
+                node.hi = len(leaves)
+                continue
+            stack.append((node, label_length, True))
+            for child in node.children.values():
+                edge_len = (min(child.end, self.size) - child.start)
+                stack.append((child, label_length + edge_len, False))
+        self.leaves = leaves
+
+    def _locate(self, pattern: str):
         """
-        Wyszukuje wszystkie wystąpienia wzorca w tekście przy pomocy drzewa sufiksów.
-
-        Zasada działania:
-         - Przechodzimy drzewo zgodnie z etykietami krawędzi i sprawdzamy czy wzorzec pokrywa się z etykietą.
-         - Jeśli uda się dopasować cały wzorzec, zbieramy wszystkie indeksy sufiksów (liść) w poddrzewie.
-
-        Zwraca:
-         - Listę pozycji, gdzie wzorzec występuje w tekście.
+        Schodzi od korzenia zgodnie ze wzorcem. Zwraca węzeł, w którego
+        poddrzewie leżą wszystkie wystąpienia, albo None, gdy wzorca nie ma.
         """
         current = self.root
         i = 0
@@ -140,32 +156,44 @@ class SuffixTree:
         while i < len(pattern):
             char = pattern[i]
             if char not in current.children:
-                return []  # wzorzec nie występuje
+                return None  # wzorzec nie występuje
             child = current.children[char]
             edge_label = self.text[child.start: min(child.end, self.size)]
             j = 0
             # Porównujemy znak po znaku etykietę krawędzi z częścią wzorca
             while j < len(edge_label) and i < len(pattern):
                 if pattern[i] != edge_label[j]:
-                    return []
+                    return None
                 i += 1
                 j += 1
             current = child
+        return current
+
+    def find_pattern(self, pattern: str) -> list:
+        """
+        Wyszukuje wszystkie wystąpienia wzorca w tekście przy pomocy drzewa sufiksów.
+
+        Zasada działania:
+         - Przechodzimy drzewo zgodnie z etykietami krawędzi i sprawdzamy czy wzorzec pokrywa się z etykietą.
+         - Jeśli uda się dopasować cały wzorzec, wystąpienia to wycinek leaves[lo:hi] węzła – bez chodzenia po poddrzewie.
+
+        Zwraca:
+         - Listę pozycji, gdzie wzorzec występuje w tekście.
+        """
+        current = self._locate(pattern)
+        if current is None:
+            return []
 
-        # Po dopasowaniu wzorca zbieramy wszystkie indeksy sufiksów z liści w poddrzewie
-        result = []
-        self._collect_suffix_indices(current, result)
-        return sorted(result)
+        # Liście poddrzewa leżą w self.leaves obok siebie
+        return sorted(self.leaves[current.lo:current.hi])
 
-    def _collect_suffix_indices(self, node: Node, result: list):
+    def count(self, pattern: str) -> int:
         """
-        Rekurencyjnie zbiera sufiks_indexy z liści (wystąpienia wzorca).
+        Liczba wystąpień wzorca w czasie O(m): zejście po drzewie i długość
+        przedziału [lo, hi) węzła, bez przeglądania poddrzewa.
         """
-        if node.suffix_index != -1:
-            result.append(node.suffix_index)
-            return
-        for child in node.children.values():
-            self._collect_suffix_indices(child, result)
+        current = self._locate(pattern)
+        return current.hi - current.lo if current is not None else 0
 
 
 # Przykładowe testy
@@ -176,7 +204,7 @@ if __name__ == "__main__":
         result = tree.find_pattern(pattern)
         print(f"Test: '{pattern}' in '{text}'")
         print(f"Expected: {expected}, Got: {result}")
-        print("✅ OK\n" if sorted(result) == sorted(expected) else "❌ FAIL\n")
+        print("✅ OK\n" if sorted(result) == sorted(expected) and tree.count(pattern) == len(expected) else "❌ FAIL\n")
 
     test_case("banana", "ana", [1, 3])
     test_case("banana", "ban", [0])
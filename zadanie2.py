@@ -1,87 +1,75 @@
-class Node:
-    def __init__(self):
-        self.children = {}
+from collections import deque
 
-class Edge:
-    def __init__(self, start, end, dest):
-        self.start = start
-        self.end = end
-        self.dest = dest
+from suffix_array_builders import build_suffix_array_sais
+from sufiksowe_wzorce import build_lcp
+from Ukkonen_algo import _build_ukkonen_tree
 
 
-def build_suffix_tree(s: str) -> Node:
+def longest_common_substring(str1: str, str2: str) -> str:
     """
-    Build a (naive) suffix tree for string s using edge-label compression.
-    Time complexity: O(n^2), space O(n^2), for demonstration.
+    Longest common substring of two strings via a generalized suffix tree
+    of str1 + '#' + str2 + '$' built with Ukkonen's algorithm in O(n).
+    A leaf's suffix index tells which string it comes from; an internal node
+    whose subtree has leaves from both strings spells a common substring.
+    String depth is carried numerically through an iterative post-order DFS,
+    so no labels are concatenated and deep trees do not hit the recursion limit.
     """
-    root = Node()
-    n = len(s)
-    for i in range(n):
-        node = root
-        j = i
-        while j < n:
-            c = s[j]
-            if c not in node.children:
-                leaf = Node()
-                node.children[c] = Edge(j, n, leaf)
-                break
-            edge = node.children[c]
-            label_len = edge.end - edge.start
-            k = 0
-            while k < label_len and j + k < n and s[edge.start + k] == s[j + k]:
-                k += 1
-            if k == label_len:
-                node = edge.dest
-                j += k
-            else:
-                mid = Node()
-                node.children[c] = Edge(edge.start, edge.start + k, mid)
-                mid.children[s[edge.start + k]] = Edge(edge.start + k, edge.end, edge.dest)
-                leaf = Node()
-                mid.children[s[j + k]] = Edge(j + k, n, leaf)
-                break
-    return root
-
-
-def longest_common_substring(str1: str, str2: str) -> str:
     sep1 = '#'
     sep2 = '$'
     assert sep1 not in str1 and sep1 not in str2
     assert sep2 not in str1 and sep2 not in str2
     s = str1 + sep1 + str2 + sep2
 
-    root = build_suffix_tree(s)
+    root = _build_ukkonen_tree(s)
     n1 = len(str1)
     n = len(s)
-    best = ""
-    def dfs(node: Node, depth: int, path: list) -> (bool, bool):
-        nonlocal best
-        has1 = False
-        has2 = False
+    best_len = 0
+    best_end = 0
+    # masks of finished subtrees: bit 1 - leaf from str1, bit 2 - leaf from str2
+    masks = []
+    stack = [(root, 0, False)]
+    while stack:
+        node, depth, done = stack.pop()
         if not node.children:
-            start_idx = n - depth
+            start_idx = node.index
             if start_idx < n1:
-                has1 = True
+                masks.append(1)
             elif n1 < start_idx < n - 1:
-                has2 = True
-            return has1, has2
-        for edge in node.children.values():
-            edge_label = s[edge.start:edge.end]
-            path.append(edge_label)
-            c1, c2 = dfs(edge.dest, depth + len(edge_label), path)
-            path.pop()
-            if c1 and c2:
-                substr = ''.join(path) + edge_label
-                if len(substr) > len(best):
-                    best = substr
-            has1 |= c1
-            has2 |= c2
-        return has1, has2
-
-    dfs(root, 0, [])
-    return best
+                masks.append(2)
+            else:
+                masks.append(0)
+            continue
+        if not done:
+            stack.append((node, depth, True))
+            for child in reversed(list(node.children.values())):
+                stack.append((child, depth + child.end.value - child.start + 1, False))
+            continue
+        mask = 0
+        for _ in range(len(node.children)):
+            mask |= masks.pop()
+        masks.append(mask)
+        if mask == 3 and depth > best_len:
+            best_len = depth
+            best_end = node.end.value + 1
+    return s[best_end - best_len:best_end]
 
 
+def longest_common_substring_dp(str1, str2):
+    # Dynamic programming approach, O(n*m)
+    n, m = len(str1), len(str2)
+    dp = [0] * (m + 1)
+    best = ""
+    best_len = 0
+    for i in range(n):
+        for j in range(m, 0, -1):
+            if str1[i] == str2[j-1]:
+                dp[j] = dp[j-1] + 1
+                if dp[j] > best_len:
+                    best_len = dp[j]
+                    best = str1[i-best_len+1:i+1]
+            else:
+                dp[j] = 0
+    return best
 
 
 def longest_common_substring_multiple(strings: list[str]) -> str:
@@ -101,52 +89,23 @@ def longest_common_substring_multiple(strings: list[str]) -> str:
         owner.append(-1)  # separator
     S = "".join(concat)
     n = len(S)
-    def build_sa(s: str) -> list[int]:
-        n = len(s)
-        k = 1
-        rank = [ord(c) for c in s]
-        tmp = [0] * n
-        sa = list(range(n))
-        while True:
-            sa.sort(key=lambda i: (rank[i], rank[i + k] if i + k < n else -1))
-            tmp[sa[0]] = 0
-            for i in range(1, n):
-                prev, curr = sa[i - 1], sa[i]
-                prev_key = (rank[prev], rank[prev + k] if prev + k < n else -1)
-                curr_key = (rank[curr], rank[curr + k] if curr + k < n else -1)
-                tmp[curr] = tmp[prev] + (prev_key < curr_key)
-            rank, tmp = tmp, rank
-            if rank[sa[-1]] == n - 1:
-                break
-            k <<= 1
-        return sa
-    def build_lcp(s: str, sa: list[int]) -> list[int]:
-        n = len(s)
-        rank = [0] * n
-        for i, pos in enumerate(sa):
-            rank[pos] = i
-        lcp = [0] * (n - 1)
-        h = 0
-        for i in range(n):
-            if rank[i] > 0:
-                j = sa[rank[i] - 1]
-                while i + h < n and j + h < n and s[i + h] == s[j + h]:
-                    h += 1
-                lcp[rank[i] - 1] = h
-                if h:
-                    h -= 1
-        return lcp
-
-    sa = build_sa(S)
+    sa = build_suffix_array_sais(S)
     lcp = build_lcp(S, sa)
-    from collections import Counter
 
-    count = Counter()
+    count = [0] * k
     distinct = 0
     best_len = 0
     best_substr = ""
     left = 0
+    # Indices into lcp with increasing values; lcp[window[0]] is the minimum
+    # of lcp[left:right], so each window costs O(1) amortised instead of a slice.
+    window = deque()
     for right in range(n):
+        if right:
+            # lcp[right - 1] joins the window (lcp between sa[right - 1] and sa[right])
+            while window and lcp[window[-1]] >= lcp[right - 1]:
+                window.pop()
+            window.append(right - 1)
         o = owner[sa[right]]
         if o >= 0:
             count[o] += 1
@@ -154,14 +113,11 @@ def longest_common_substring_multiple(strings: list[str]) -> str:
                 distinct += 1
         while distinct == k and left <= right:
             if right - left + 1 >= k:
-                # Compute minimal LCP in this window
-                window_lcp = lcp[left:right]  # lcp between sa[left..right]
-                curr_len = min(window_lcp) if window_lcp else 0
+                # Minimal LCP in this window, shared by all suffixes sa[left..right]
+                curr_len = lcp[window[0]] if left < right else 0
                 if curr_len > best_len:
                     best_len = curr_len
-                    # Find position of minimal LCP
-                    idx_min = window_lcp.index(curr_len)
-                    pos = sa[left + idx_min]
+                    pos = sa[left]
                     best_substr = S[pos: pos + curr_len]
             # Remove left element
             o_left = owner[sa[left]]
@@ -170,9 +126,60 @@ def longest_common_substring_multiple(strings: list[str]) -> str:
                 if count[o_left] == 0:
                     distinct -= 1
             left += 1
+            if window and window[0] < left:
+                window.popleft()
 
     return best_substr
 
+def benchmark_lcs(lengths=(500, 1000, 2000, 1_000_000), dp_max: int = 2000):
+    """
+    Times longest_common_substring (Ukkonen) against longest_common_substring_dp
+    on pairs of random DNA strings. The O(n*m) DP is skipped (None) above dp_max.
+    Returns a list of (length, tree seconds, dp seconds or None).
+    """
+    import random
+    import time
+
+    random.seed(0)
+    rows = []
+    for n in lengths:
+        s1 = ''.join(random.choices('acgt', k=n))
+        s2 = ''.join(random.choices('acgt', k=n))
+        start = time.perf_counter()
+        best = longest_common_substring(s1, s2)
+        tree_time = time.perf_counter() - start
+        dp_time = None
+        if n <= dp_max:
+            start = time.perf_counter()
+            assert len(longest_common_substring_dp(s1, s2)) == len(best)
+            dp_time = time.perf_counter() - start
+        rows.append((n, tree_time, dp_time))
+    return rows
+
+
+def benchmark_lcs_multiple(k: int = 20, length: int = 100_000, common: int = 50):
+    """
+    Times longest_common_substring_multiple on k random DNA strings of the given
+    length, each containing the same planted substring of `common` characters.
+    Returns (elapsed seconds, length of the found substring).
+    """
+    import random
+    import time
+
+    random.seed(0)
+    shared = ''.join(random.choices('acgt', k=common))
+    strings = []
+    for _ in range(k):
+        s = ''.join(random.choices('acgt', k=length - common))
+        pos = random.randrange(len(s) + 1)
+        strings.append(s[:pos] + shared + s[pos:])
+    start = time.perf_counter()
+    best = longest_common_substring_multiple(strings)
+    elapsed = time.perf_counter() - start
+    assert len(best) >= common and all(best in s for s in strings)
+    return elapsed, len(best)
+
+
 result = longest_common_substring_multiple(["kot", "kotpies", "oko"])
 print(result)
 
@@ -254,24 +261,12 @@ if __name__ == "__main__":
     testcase2()
     testcase3()
 
+    for n, tree_time, dp_time in benchmark_lcs():
+        dp_info = f"{dp_time:.3f} s" if dp_time is not None else "skipped"
+        print(f"LCS n={n}: suffix tree {tree_time:.3f} s, DP {dp_info}")
 
-
-def longest_common_substring_dp(str1, str2):
-    # Dynamic programming approach, O(n*m)
-    n, m = len(str1), len(str2)
-    dp = [0] * (m + 1)
-    best = ""
-    best_len = 0
-    for i in range(n):
-        for j in range(m, 0, -1):
-            if str1[i] == str2[j-1]:
-                dp[j] = dp[j-1] + 1
-                if dp[j] > best_len:
-                    best_len = dp[j]
-                    best = str1[i-best_len+1:i+1]
-            else:
-                dp[j] = 0
-    return best
+    elapsed, best_len = benchmark_lcs_multiple()
+    print(f"LCS of 20 x 100k strings: length {best_len} in {elapsed:.2f} s")
 
 
 
@@ -4,13 +4,26 @@ import random
 import string
 import matplotlib.pyplot as plt
 
+from suffix_array_builders import build_suffix_array_numpy, build_suffix_array_sais
+from Ukkonen_algo import CompactSuffixTree
+
 # -------------------------
-# Suffix Array implementation (Doubling algorithm)
+# Suffix Array implementation (Doubling algorithm, SA-IS or NumPy doubling)
 # -------------------------
 class SuffixArray:
-    def __init__(self, text):
+    METHODS = ('doubling', 'sais', 'numpy')
+
+    def __init__(self, text, method='doubling'):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown suffix array method: {method!r}")
         self.text = text
-        self.sa = self.build_sa()
+        self.method = method
+        if method == 'sais':
+            self.sa = build_suffix_array_sais(text)
+        elif method == 'numpy':
+            self.sa = build_suffix_array_numpy(text)
+        else:
+            self.sa = self.build_sa()
 
     def build_sa(self):
         s = self.text
@@ -37,6 +50,8 @@ class SuffixArray:
 # Suffix Tree using Ukkonen's algorithm
 # -------------------------
 class SuffixTreeNode:
+    __slots__ = ('children', 'suffix_link', 'start', 'end')
+
     def __init__(self):
         self.children = {}
         self.suffix_link = None
@@ -163,27 +178,49 @@ def measure(text):
     mem_st = peak / 1024        # KB
     size_st = count_nodes(st.root)
 
-    return time_sa, mem_sa, size_sa, time_st, mem_st, size_st
+    # Compact suffix tree (struct-of-arrays columns)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    cst = CompactSuffixTree.build(text)
+    t1 = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    time_cst = (t1 - t0) * 1000  # ms
+    mem_cst = peak / 1024        # KB
+    size_cst = len(cst)
+
+    # Bytes per text character for each structure
+    n = len(text)
+    print(f"n={n:>7}: bytes/char  SA {mem_sa * 1024 / n:8.1f}  "
+          f"ST {mem_st * 1024 / n:8.1f}  compact ST {mem_cst * 1024 / n:8.1f}")
+
+    return (time_sa, mem_sa, size_sa, time_st, mem_st, size_st,
+            time_cst, mem_cst, size_cst)
 
 # Test on increasing text sizes
 sizes = [100, 1000, 10000, 100000]
 time_sa_list, mem_sa_list, size_sa_list = [], [], []
 time_st_list, mem_st_list, size_st_list = [], [], []
+time_cst_list, mem_cst_list, size_cst_list = [], [], []
 
 for n in sizes:
     text = ''.join(random.choices(string.ascii_lowercase, k=n))
-    t_sa, m_sa, s_sa, t_st, m_st, s_st = measure(text)
+    t_sa, m_sa, s_sa, t_st, m_st, s_st, t_cst, m_cst, s_cst = measure(text)
     time_sa_list.append(t_sa)
     mem_sa_list.append(m_sa)
     size_sa_list.append(s_sa)
     time_st_list.append(t_st)
     mem_st_list.append(m_st)
     size_st_list.append(s_st)
+    time_cst_list.append(t_cst)
+    mem_cst_list.append(m_cst)
+    size_cst_list.append(s_cst)
 
 # Plot: Construction Time vs Text Size (log-log)
 plt.figure()
 plt.plot(sizes, time_sa_list, marker='o', label='Suffix Array')
 plt.plot(sizes, time_st_list, marker='o', label='Suffix Tree')
+plt.plot(sizes, time_cst_list, marker='o', label='Compact Suffix Tree')
 plt.xscale('log'); plt.yscale('log')
 plt.xlabel('Text Size (n)')
 plt.ylabel('Construction Time (ms)')
@@ -195,6 +232,7 @@ plt.show()
 plt.figure()
 plt.plot(sizes, mem_sa_list, marker='o', label='Suffix Array')
 plt.plot(sizes, mem_st_list, marker='o', label='Suffix Tree')
+plt.plot(sizes, mem_cst_list, marker='o', label='Compact Suffix Tree')
 plt.xscale('log'); plt.yscale('log')
 plt.xlabel('Text Size (n)')
 plt.ylabel('Memory Usage (KB)')
@@ -206,8 +244,38 @@ plt.show()
 plt.figure()
 plt.plot(sizes, size_sa_list, marker='o', label='Suffix Array')
 plt.plot(sizes, size_st_list, marker='o', label='Suffix Tree')
+plt.plot(sizes, size_cst_list, marker='o', label='Compact Suffix Tree')
 plt.xlabel('Text Size (n)')
 plt.ylabel('Structure Size (# elements/nodes)')
 plt.legend()
 plt.title('Structure Size vs Text Size')
 plt.show()
+
+# -------------------------
+# Suffix array builders: doubling vs SA-IS vs NumPy doubling, sweep extended to 10^7
+# -------------------------
+sa_sizes = [100, 1000, 10000, 100000, 1000000, 10000000]
+DOUBLING_MAX_N = 100000   # the tuple-sort doubling builder is impractical beyond this
+sa_times = {method: [] for method in SuffixArray.METHODS}
+
+for n in sa_sizes:
+    text = ''.join(random.choices(string.ascii_lowercase, k=n))
+    for method in SuffixArray.METHODS:
+        if method == 'doubling' and n > DOUBLING_MAX_N:
+            continue
+        t0 = time.perf_counter()
+        SuffixArray(text, method=method)
+        elapsed = (time.perf_counter() - t0) * 1000  # ms
+        sa_times[method].append(elapsed)
+        print(f"{method:<9} n={n:>9}: {elapsed:.1f} ms")
+
+# Plot: Suffix array construction time vs text size (log-log)
+plt.figure()
+for method, times in sa_times.items():
+    plt.plot(sa_sizes[:len(times)], times, marker='o', label=method)
+plt.xscale('log'); plt.yscale('log')
+plt.xlabel('Text Size (n)')
+plt.ylabel('Construction Time (ms)')
+plt.legend()
+plt.title('Suffix Array Construction: Doubling vs SA-IS vs NumPy')
+plt.show()
@@ -182,6 +182,34 @@ plt.tight_layout()
 plt.show()
 
 
+#porownania Boyer-Moore z regula Galila na tekscie okresowym
+def compare_galil():
+    lengths = [1, 2, 5, 10, 20, 50, 100]
+    text1 = "sa"*1000
+    y_val_comps = {"Boyer-Moore": [], "Boyer-Moore + Galil": []}
+    for length in lengths:
+        pattern = "sa"*length
+        hits, metrics = search_boyer_moore(text1, pattern)
+        hits_galil, metrics_galil = search_boyer_moore(text1, pattern, galil=True)
+        assert hits == hits_galil
+        y_val_comps["Boyer-Moore"].append(metrics['comparisons'])
+        y_val_comps["Boyer-Moore + Galil"].append(metrics_galil['comparisons'])
+    lengths = [x * 2 for x in lengths]
+    return lengths, y_val_comps
+g = compare_galil()
+plt.figure(figsize=(8,5))
+for name, comps in g[1].items():
+    plt.plot(g[0], comps, marker='o', label=name)
+
+plt.title('Boyer-Moore na tekście okresowym ("sa"*1000)')
+plt.xlabel('Długość wzorca')
+plt.ylabel('Liczba porównań')
+plt.legend()
+plt.grid(True)
+plt.tight_layout()
+plt.show()
+
+
 
 
 